@@ -0,0 +1,225 @@
+"""
+Offline benchmarks for the Git extension's rendering pipeline.
+
+Runs clean_content, prepare_issue, prepare_pr, snippet slicing and diff rendering
+directly over the synthetic payloads in benchmarks/corpus, and reports throughput
+and peak memory for each. No Discord or GitHub connection is needed.
+
+The corpus is hand-made in the shape of GitHub's responses rather than recorded
+from it, so it won't catch quirks that only show up in real payloads.
+
+Usage: python -m benchmarks.git_render [--min-time 0.5] [--save FILE] [--compare FILE]
+       python -m benchmarks.git_render --check [--update-expected]
+"""
+import argparse
+import datetime
+import gc
+import json
+import sys
+import time
+import tracemalloc
+import types
+import typing
+from pathlib import Path
+
+import interactions as ipy
+
+from exts.git import Git
+
+CORPUS_PATH = Path(__file__).parent / "corpus"
+EXPECTED_PATH = CORPUS_PATH / "expected.json"
+
+
+class Case(typing.NamedTuple):
+    group: str
+    name: str
+    size: int  # bytes of input, for throughput
+    func: typing.Callable[[], typing.Any]
+
+
+def to_namespace(data: typing.Any) -> typing.Any:
+    # the git ext only ever reads attributes off of issues, so this is all we need
+    # to stand in for githubkit's models without tying the corpus to its version
+    if isinstance(data, dict):
+        return types.SimpleNamespace(**{k: to_namespace(v) for k, v in data.items()})
+    if isinstance(data, str) and data[:4].isdigit() and "T" in data:
+        try:
+            return datetime.datetime.fromisoformat(data)
+        except ValueError:
+            pass
+    return data
+
+
+def create_git() -> Git:
+    bot = ipy.Client()
+    bot.session = None  # type: ignore # nothing here does any http
+    return Git(bot)
+
+
+def load_cases(git: Git) -> list[Case]:
+    cases: list[Case] = []
+
+    issues = json.loads((CORPUS_PATH / "issues.json").read_text(encoding="utf-8"))
+    for raw in issues:
+        issue = to_namespace(raw)
+        number = raw["html_url"].rsplit("/", 1)[-1]
+        size = len((raw["body"] or "").encode())
+
+        if raw["body"]:
+            cases.append(
+                Case("clean_content", number, size, lambda b=raw["body"]: git.clean_content(b))
+            )
+
+        if raw["pull_request"]:
+            cases.append(
+                Case("prepare_pr", number, size, lambda i=issue: git.prepare_pr(i).to_dict())
+            )
+        else:
+            cases.append(
+                Case("prepare_issue", number, size, lambda i=issue: git.prepare_issue(i).to_dict())
+            )
+
+    snippets = json.loads((CORPUS_PATH / "snippets.json").read_text(encoding="utf-8"))
+    for snippet in snippets:
+        file_data = (CORPUS_PATH / "files" / snippet["file"]).read_text(encoding="utf-8")
+
+        # same line number handling as resolve_gh_snippet
+        start_line_num = snippet["start"]
+        end_line_num = snippet["end"] + 1 if snippet["end"] else start_line_num + 1
+
+        name = f"{snippet['file']}#L{snippet['start']}"
+        if snippet["end"]:
+            name += f"-L{snippet['end']}"
+
+        cases.append(
+            Case(
+                "render_snippet",
+                name,
+                len(file_data.encode()),
+                lambda f=file_data, s=start_line_num, e=end_line_num: git.render_snippet(f, s, e),
+            )
+        )
+
+    for path in sorted((CORPUS_PATH / "diffs").glob("*.diff")):
+        file_data = path.read_text(encoding="utf-8")
+        cases.append(
+            Case(
+                "render_diff",
+                path.stem,
+                len(file_data.encode()),
+                lambda f=file_data: git.render_diff(f),
+            )
+        )
+
+    return cases
+
+
+def measure(case: Case, min_time: float) -> dict[str, float]:
+    case.func()  # warm up
+
+    iterations = 0
+    gc.disable()
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        case.func()
+        iterations += 1
+        elapsed = time.perf_counter() - start
+    gc.enable()
+
+    # tracemalloc slows everything down a lot, so it gets its own run
+    tracemalloc.start()
+    case.func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ops_per_sec": iterations / elapsed,
+        "mib_per_sec": case.size * iterations / elapsed / 1048576,
+        "peak_kib": peak / 1024,
+    }
+
+
+def check(cases: list[Case], update: bool, group_filter: str) -> int:
+    rendered = {f"{c.group}:{c.name}": c.func() for c in cases}
+
+    if update:
+        # keep whatever a --filter left out
+        expected = (
+            json.loads(EXPECTED_PATH.read_text(encoding="utf-8")) if EXPECTED_PATH.exists() else {}
+        )
+        expected.update(rendered)
+        EXPECTED_PATH.write_text(
+            json.dumps(expected, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+        )
+        print(f"Wrote {len(rendered)} expected outputs to {EXPECTED_PATH}.")
+        return 0
+
+    expected = json.loads(EXPECTED_PATH.read_text(encoding="utf-8"))
+    mismatches = [key for key in rendered if rendered[key] != expected.get(key)]
+    missing = [
+        key for key in expected if group_filter in key.split(":", 1)[0] and key not in rendered
+    ]
+
+    for key in mismatches:
+        print(f"MISMATCH {key}")
+    for key in missing:
+        print(f"MISSING  {key}")
+
+    print(f"{len(rendered) - len(mismatches)}/{len(rendered)} outputs match.")
+    return 1 if mismatches or missing else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds to run each case")
+    parser.add_argument("--filter", default="", help="only run cases whose group contains this")
+    parser.add_argument("--save", type=Path, help="write results as json to this file")
+    parser.add_argument("--compare", type=Path, help="compare against results saved earlier")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="allowed slowdown when comparing (0.2 = 20%%)"
+    )
+    parser.add_argument("--check", action="store_true", help="check outputs against the corpus")
+    parser.add_argument("--update-expected", action="store_true", help="rewrite expected outputs")
+    args = parser.parse_args()
+
+    git = create_git()
+    cases = [c for c in load_cases(git) if args.filter in c.group]
+
+    if args.check or args.update_expected:
+        return check(cases, args.update_expected, args.filter)
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else {}
+    results: dict[str, dict[str, float]] = {}
+    regressions = 0
+
+    print(f"{'case':<55} {'ops/s':>11} {'MiB/s':>9} {'peak KiB':>10}")
+    for case in cases:
+        key = f"{case.group}:{case.name}"
+        result = results[key] = measure(case, args.min_time)
+
+        line = (
+            f"{key:<55} {result['ops_per_sec']:>11.1f} {result['mib_per_sec']:>9.2f}"
+            f" {result['peak_kib']:>10.1f}"
+        )
+
+        if old := baseline.get(key):
+            change = result["ops_per_sec"] / old["ops_per_sec"] - 1
+            line += f"  {change:+.0%}"
+            if change < -args.tolerance:
+                line += "  REGRESSION"
+                regressions += 1
+
+        print(line)
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2) + "\n")
+
+    if regressions:
+        print(f"{regressions} case(s) regressed by more than {args.tolerance:.0%}.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
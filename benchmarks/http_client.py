@@ -0,0 +1,96 @@
+"""
+Compares connection setup for repeated GitHub fetches between a throwaway session,
+a bare `aiohttp.ClientSession()` and the pooled session from `common.http`.
+
+Usage: python -m benchmarks.http_client [--rounds 5] [--gap 16] [--url URL]
+
+The default gap is just past aiohttp's default 15 second keep-alive, which is roughly
+how far apart links get posted in the help channels.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import types
+
+import aiohttp
+
+from common.http import create_session
+
+DEFAULT_URL = "https://raw.githubusercontent.com/interactions-py/interactions.py/stable/README.md"
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.totals: list[float] = []
+        self.setups: list[float] = []
+        self.reused = 0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        config = aiohttp.TraceConfig()
+
+        async def on_create_start(session, ctx: types.SimpleNamespace, params):
+            ctx.setup_start = time.perf_counter()
+
+        async def on_create_end(session, ctx: types.SimpleNamespace, params):
+            self.setups.append(time.perf_counter() - ctx.setup_start)
+
+        async def on_reuse(session, ctx, params):
+            self.reused += 1
+
+        config.on_connection_create_start.append(on_create_start)
+        config.on_connection_create_end.append(on_create_end)
+        config.on_connection_reuseconn.append(on_reuse)
+        return config
+
+    def report(self, name: str) -> str:
+        setup = statistics.mean(self.setups) * 1000 if self.setups else 0.0
+        return (
+            f"{name:<10} mean {statistics.mean(self.totals) * 1000:8.2f} ms  "
+            f"p50 {statistics.median(self.totals) * 1000:8.2f} ms  "
+            f"new conns {len(self.setups):>3} (mean setup {setup:7.2f} ms)  "
+            f"reused {self.reused:>3}"
+        )
+
+
+async def fetch(session: aiohttp.ClientSession, url: str, stats: Stats) -> None:
+    start = time.perf_counter()
+    async with session.get(url) as resp:
+        await resp.read()
+    stats.totals.append(time.perf_counter() - start)
+
+
+async def main(rounds: int, gap: float, url: str) -> None:
+    cold, bare, pooled = Stats(), Stats(), Stats()
+
+    bare_session = aiohttp.ClientSession(trace_configs=[bare.trace_config()])
+    pooled_session = create_session(trace_configs=[pooled.trace_config()])
+
+    try:
+        for i in range(rounds):
+            async with aiohttp.ClientSession(trace_configs=[cold.trace_config()]) as cold_session:
+                await fetch(cold_session, url, cold)
+
+            await fetch(bare_session, url, bare)
+            await fetch(pooled_session, url, pooled)
+
+            if i != rounds - 1:
+                await asyncio.sleep(gap)
+    finally:
+        await bare_session.close()
+        await pooled_session.close()
+
+    print(f"{rounds} fetches of {url}, {gap}s apart")
+    print(cold.report("cold"))
+    print(bare.report("bare"))
+    print(pooled.report("pooled"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--gap", type=float, default=16.0)
+    parser.add_argument("--url", default=DEFAULT_URL)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.rounds, args.gap, args.url))
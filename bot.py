@@ -1,21 +1,33 @@
+import time
+
+# as early as possible, so the startup profile covers importing everything too
+STARTED_AT = time.perf_counter()
+
 from dotenv import load_dotenv
 
 load_dotenv()
 
 import asyncio
+import importlib
 import logging
+import logging.handlers
 import os
 
-import aiohttp
 import interactions as ipy
 from beanie import init_beanie
 from interactions.ext import prefixed_commands
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo.server_api import ServerApi
 
+import common.http as http
+import common.lazy as lazy
+import common.logs as logs
+import common.metrics as metrics
+import common.retry as retry
+import common.startup as startup
 import common.utils as utils
 from common.const import *
-from common.models import Tag
+from common.models import HelpStats, HelpThread, Report, RoleJob, Tag
 
 logger = logging.getLogger("astro_bot")
 logger.setLevel(logging.DEBUG)
@@ -23,12 +35,22 @@ logger.setLevel(logging.DEBUG)
 
 stderr_handler = logging.StreamHandler()
 stderr_handler.setLevel(logging.WARNING)
-logger.addHandler(stderr_handler)
 
-file_handler = logging.FileHandler(filename="discord.log", encoding="utf-8", mode="a")
-file_handler.setFormatter(logging.Formatter("%(asctime)s:%(levelname)s:%(name)s: %(message)s"))
+file_handler = logging.handlers.RotatingFileHandler(
+    filename="discord.log",
+    encoding="utf-8",
+    mode="a",
+    maxBytes=logs.LOG_MAX_BYTES,
+    backupCount=logs.LOG_BACKUP_COUNT,
+)
+if logs.LOG_FORMAT == "json":
+    file_handler.setFormatter(logs.JSONFormatter())
+else:
+    file_handler.setFormatter(logging.Formatter("%(asctime)s:%(levelname)s:%(name)s: %(message)s"))
 file_handler.setLevel(logging.INFO)
-logger.addHandler(file_handler)
+
+# the handlers write from their own thread, so the event loop never waits on them
+log_listener = logs.start_queue_logging(logger, [stderr_handler, file_handler])
 
 activity = ipy.Activity.create(name="you. 👀", type=ipy.ActivityType.WATCHING)
 
@@ -56,20 +78,63 @@ prefixed_commands.setup(bot)
 
 
 async def start():
-    client = AsyncIOMotorClient(os.environ["MONGO_DB_URL"], server_api=ServerApi("1"))
-    await init_beanie(client.Astro, document_models=[Tag])  # type: ignore
-
-    bot.session = aiohttp.ClientSession()
-
+    phases = startup.PhaseRunner(STARTED_AT)
     ext_list = utils.get_all_extensions(SRC_PATH)
 
-    for ext in ext_list:
-        bot.load_extension(ext)
+    # extensions in lazy mode are only imported once something in them is used
+    bot.lazy = lazy.LazyExtensions(bot)
+    stubbed = [ext for ext in ext_list if bot.lazy.can_stub(ext)]
+    ext_list = [ext for ext in ext_list if ext not in stubbed]
+
+    @phases.phase("database")
+    async def database():
+        client = AsyncIOMotorClient(os.environ["MONGO_DB_URL"], server_api=ServerApi("1"))
+        models = [Tag, HelpThread, HelpStats, RoleJob, Report]
+        await init_beanie(client.Astro, document_models=models)  # type: ignore
+
+    @phases.phase("http")
+    async def http_session():
+        bot.session = http.create_session()
+        bot.retries = retry.RetryQueue()
+
+    @phases.phase("imports")
+    async def imports():
+        # importing is most of the work of loading an extension, and it doesn't
+        # need the event loop, so it can happen while we wait on mongo
+        def import_all():
+            for ext in ext_list:
+                importlib.import_module(ext)
+
+        await asyncio.to_thread(import_all)
+
+    @phases.phase("extensions", after=("http", "imports"))
+    async def extensions():
+        for ext in ext_list:
+            bot.lazy.load(ext)
+        for ext in stubbed:
+            bot.lazy.stub(ext)
+        bot.lazy.save()
+
+    # the metrics endpoint is opt-in, since it shouldn't be reachable from just anywhere
+    if metrics_port := os.environ.get("METRICS_PORT"):
+
+        @phases.phase("metrics")
+        async def metrics_server():
+            host = os.environ.get("METRICS_HOST", "127.0.0.1")
+            bot.metrics_runner = await metrics.serve(host, int(metrics_port))
 
     try:
+        await phases.run()
+        logger.info(phases.profile())
+
         await bot.astart(os.environ["TOKEN"])
     finally:
-        await bot.session.close()
+        if hasattr(bot, "retries"):
+            bot.retries.close()
+        if hasattr(bot, "session"):
+            await bot.session.close()
+        if hasattr(bot, "metrics_runner"):
+            await bot.metrics_runner.cleanup()
 
 
 @ipy.listen("command_error", disable_default_listeners=True)
@@ -143,6 +208,13 @@ async def on_command_error(event: ipy.events.CommandError):
 @ipy.listen("startup")
 async def on_startup():
     print(f"Logged in as {bot.user.tag}.")
+    logger.info(f"Ready {time.perf_counter() - STARTED_AT:.2f}s after starting.")
+    bot.lazy.start_warm_up()
+
+
+# these aren't part of any extension, so nothing else gets to them
+utils.instrument_listener(on_command_error, "bot")
+utils.instrument_listener(on_startup, "bot")
 
 
 if __name__ == "__main__":
@@ -150,3 +222,5 @@ if __name__ == "__main__":
         asyncio.run(start())
     except KeyboardInterrupt:
         logger.info("Shutting down.")
+    finally:
+        log_listener.stop()
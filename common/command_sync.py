@@ -0,0 +1,179 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import typing
+from pathlib import Path
+
+import interactions as ipy
+from interactions.models.internal import application_commands
+
+from common.const import SRC_PATH
+
+__all__ = (
+    "CACHE_PATH",
+    "Change",
+    "command_key",
+    "command_hash",
+    "plan",
+    "apply",
+    "format_plan",
+    "clear_cache",
+)
+
+CACHE_PATH = Path(os.environ.get("COMMANDS_CACHE_PATH", f"{SRC_PATH}/.cache/commands.json"))
+
+logger = logging.getLogger("astro_bot.command_sync")
+
+# scope -> command key -> {"id": ..., "hash": ...} of what discord has, as of our last sync
+RemoteState = dict[str, dict[str, dict[str, str]]]
+
+
+class Change(typing.NamedTuple):
+    action: typing.Literal["create", "update", "delete"]
+    scope: int
+    key: str
+    name: str
+    command: typing.Optional[dict]  # what to send - None for deletes
+    command_id: typing.Optional[str]  # what to delete - None for creates
+
+
+def command_key(command: dict) -> str:
+    # context menus can share a name with a slash command, so the type is part of it
+    return f"{int(command.get('type', ipy.CommandType.CHAT_INPUT))}:{command['name']}"
+
+
+def command_hash(command: dict) -> str:
+    return hashlib.sha256(
+        json.dumps(command, sort_keys=True, separators=(",", ":"), default=str).encode()
+    ).hexdigest()
+
+
+def read_cache() -> RemoteState:
+    try:
+        with CACHE_PATH.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_cache(state: RemoteState) -> None:
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = CACHE_PATH.with_suffix(".tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, CACHE_PATH)
+
+
+def clear_cache() -> None:
+    CACHE_PATH.unlink(missing_ok=True)
+
+
+async def _fetch_remote_state(
+    bot: ipy.Client, scope: int, local_commands: list[dict]
+) -> dict[str, dict[str, str]]:
+    """
+    Builds the cached state for a scope we know nothing about from what discord has.
+
+    Discord fills in defaults we don't send, so its copy never hashes the same as ours -
+    instead, interactions.py's own comparison decides if they match, and if they do,
+    the local hash is stored for it.
+    """
+    local_by_key = {command_key(c): c for c in local_commands}
+    state: dict[str, dict[str, str]] = {}
+
+    for remote in await bot.http.get_application_commands(bot.app.id, scope):
+        key = command_key(remote)
+        local = local_by_key.get(key)
+        matches = local is not None and not application_commands.sync_needed(local, remote)
+        state[key] = {"id": str(remote["id"]), "hash": command_hash(local) if matches else ""}
+
+    return state
+
+
+async def plan(bot: ipy.Client, scopes: typing.Iterable[int]) -> list[Change]:
+    """Works out what has to change for discord to match the loaded extensions."""
+    local_json = application_commands.application_commands_to_dict(bot.interactions_by_scope, bot)
+    state = read_cache()
+    fetched = False
+
+    changes: list[Change] = []
+    for scope in scopes:
+        local_commands = local_json.get(scope, [])
+        if str(scope) not in state:
+            state[str(scope)] = await _fetch_remote_state(bot, scope, local_commands)
+            fetched = True
+        remote = state[str(scope)]
+
+        local_keys = set()
+        for command in local_commands:
+            key = command_key(command)
+            local_keys.add(key)
+
+            if key not in remote:
+                changes.append(Change("create", scope, key, command["name"], command, None))
+            elif remote[key]["hash"] != command_hash(command):
+                changes.append(
+                    Change("update", scope, key, command["name"], command, remote[key]["id"])
+                )
+
+        for key, entry in remote.items():
+            if key not in local_keys:
+                changes.append(
+                    Change("delete", scope, key, key.split(":", 1)[1], None, entry["id"])
+                )
+
+    if fetched:
+        write_cache(state)
+    return changes
+
+
+async def apply(bot: ipy.Client, changes: list[Change]) -> None:
+    state = read_cache()
+
+    async def run(change: Change):
+        remote = state.setdefault(str(change.scope), {})
+
+        if change.action == "delete":
+            await bot.http.delete_application_command(bot.app.id, change.scope, change.command_id)
+            remote.pop(change.key, None)
+            return
+
+        # creating a command with the name of one that exists overwrites it,
+        # so this covers updates too
+        data = await bot.http.create_application_command(
+            bot.app.id, change.command, change.scope  # type: ignore
+        )
+        remote[change.key] = {"id": str(data["id"]), "hash": command_hash(change.command)}  # type: ignore
+        bot._cache_sync_response([data], change.scope)  # type: ignore
+
+    try:
+        # interactions.py keeps these within the application commands rate limit for us
+        results = await asyncio.gather(*(run(c) for c in changes), return_exceptions=True)
+    finally:
+        write_cache(state)
+
+    errors = [r for r in results if isinstance(r, BaseException)]
+    for change, result in zip(changes, results):
+        if isinstance(result, BaseException):
+            logger.error(
+                f"Could not {change.action} /{change.name} in {change.scope}.", exc_info=result
+            )
+    if errors:
+        raise errors[0]
+
+
+def format_plan(changes: list[Change]) -> str:
+    if not changes:
+        return "Everything is up to date."
+
+    symbols = {"create": "+", "update": "~", "delete": "-"}
+    lines = [
+        f"{symbols[c.action]} {c.name} ({'global' if c.scope == 0 else c.scope})"
+        for c in sorted(changes, key=lambda c: (c.scope, c.name))
+    ]
+    diff = "\n".join(lines)
+    if len(diff) > 1900:  # messages can only be so long
+        diff = diff[:1900].rsplit("\n", 1)[0] + "\n..."
+    return f"```diff\n{diff}\n```"
@@ -0,0 +1,260 @@
+import asyncio
+import contextlib
+import enum
+import io
+import logging
+import tempfile
+import time
+import typing
+
+import aiohttp
+from yarl import URL
+
+import common.metrics as metrics
+
+__all__ = (
+    "MAX_CONNECTIONS",
+    "DEFAULT_HOST_CONNECTIONS",
+    "HOST_CONNECTIONS",
+    "DNS_CACHE_TTL",
+    "KEEPALIVE_TIMEOUT",
+    "create_session",
+    "HOST_TIMEOUTS",
+    "DEFAULT_TIMEOUT",
+    "CircuitState",
+    "CircuitOpenError",
+    "CircuitBreaker",
+    "get_breaker",
+    "timeout_for",
+    "request",
+    "SPOOL_SIZE",
+    "CHUNK_SIZE",
+    "download",
+)
+
+try:
+    import brotli  # noqa: F401
+
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+logger = logging.getLogger("astro_bot.http")
+
+# github is usually quick, so if it isn't, something is wrong and we'd rather give up
+# discord's cdn can legitimately take a while for 8 MiB attachments, though
+HOST_TIMEOUTS: dict[str, aiohttp.ClientTimeout] = {
+    "github.com": aiohttp.ClientTimeout(total=10, connect=3, sock_read=5),
+    "raw.githubusercontent.com": aiohttp.ClientTimeout(total=10, connect=3, sock_read=5),
+    "interactions-py.github.io": aiohttp.ClientTimeout(total=20, connect=5, sock_read=10),
+    "cdn.discordapp.com": aiohttp.ClientTimeout(total=30, connect=5, sock_read=10),
+    "media.discordapp.net": aiohttp.ClientTimeout(total=30, connect=5, sock_read=10),
+}
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5, sock_read=10)
+
+
+# the session is shared by every extension, so this is the bot's whole budget
+MAX_CONNECTIONS = 32
+DEFAULT_HOST_CONNECTIONS = 8
+# hosts we don't want to hammer get less than the default
+HOST_CONNECTIONS: dict[str, int] = {
+    "interactions-py.github.io": 2,
+    "github.com": 4,
+}
+DNS_CACHE_TTL = 300
+# github and discord's cdn both keep idle connections around for a while,
+# so there's no point in us dropping ours after aiohttp's default of 15 seconds
+KEEPALIVE_TIMEOUT = 60
+
+
+def create_session(**kwargs: typing.Any) -> aiohttp.ClientSession:
+    """Creates the pooled session the bot shares between all of its extensions."""
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONNECTIONS,
+        limit_per_host=DEFAULT_HOST_CONNECTIONS,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+    kwargs.setdefault("headers", {"Accept-Encoding": ACCEPT_ENCODING})
+    return aiohttp.ClientSession(
+        connector=connector, timeout=DEFAULT_TIMEOUT, auto_decompress=True, **kwargs
+    )
+
+
+_host_semaphores: dict[str, asyncio.Semaphore] = {}
+
+
+def _host_semaphore(host: str) -> typing.Optional[asyncio.Semaphore]:
+    if host not in HOST_CONNECTIONS:
+        return None  # the connector's limit_per_host covers it
+
+    if not (semaphore := _host_semaphores.get(host)):
+        semaphore = _host_semaphores[host] = asyncio.Semaphore(HOST_CONNECTIONS[host])
+    return semaphore
+
+
+class CircuitState(enum.IntEnum):
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+
+class CircuitOpenError(aiohttp.ClientConnectionError):
+    """Raised instead of making a request to a host whose circuit is open."""
+
+    def __init__(self, host: str) -> None:
+        super().__init__(f"Circuit for {host} is open.")
+        self.host = host
+
+
+class CircuitBreaker:
+    """
+    Fast-fails requests to a host after it keeps failing.
+
+    After `failure_threshold` failures in a row, the circuit opens and every
+    request is rejected for `reset_after` seconds. After that, one request is
+    let through as a probe - if it works, the circuit closes again, otherwise
+    it goes back to being open.
+    """
+
+    def __init__(self, host: str, failure_threshold: int = 5, reset_after: float = 30.0) -> None:
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def before_request(self) -> None:
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_after:
+                raise CircuitOpenError(self.host)
+            self._set_state(CircuitState.HALF_OPEN)
+
+        if self.state == CircuitState.HALF_OPEN:
+            if self._probing:
+                raise CircuitOpenError(self.host)
+            self._probing = True
+
+    def record(self, ok: typing.Optional[bool]) -> None:
+        # None means we never found out (ie the request was cancelled),
+        # so just free up the probe slot without judging the host
+        self._probing = False
+
+        if ok is None:
+            return
+
+        if ok:
+            self.failures = 0
+            if self.state != CircuitState.CLOSED:
+                self._set_state(CircuitState.CLOSED)
+            return
+
+        self.failures += 1
+        if self.state == CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            if self.state != CircuitState.OPEN:
+                self._set_state(CircuitState.OPEN)
+
+    def _set_state(self, state: CircuitState) -> None:
+        logger.warning(f"Circuit for {self.host} went from {self.state.name} to {state.name}.")
+        self.state = state
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    if not (breaker := _breakers.get(host)):
+        breaker = _breakers[host] = CircuitBreaker(host)
+        metrics.gauge("astro_http_circuit_state", lambda: breaker.state, host=host)
+        metrics.gauge("astro_http_circuit_failures", lambda: breaker.failures, host=host)
+    return breaker
+
+
+def timeout_for(host: str) -> aiohttp.ClientTimeout:
+    return HOST_TIMEOUTS.get(host, DEFAULT_TIMEOUT)
+
+
+@contextlib.asynccontextmanager
+async def request(
+    session: aiohttp.ClientSession, method: str, url: str, **kwargs: typing.Any
+) -> typing.AsyncIterator[aiohttp.ClientResponse]:
+    """
+    `session.request`, but with the host's timeout applied and guarded by its circuit breaker.
+
+    Timeouts, connection errors, 5xxs and 429s count against the host. Anything else
+    (including 4xxs) means the host is up, even if we didn't like the answer.
+    """
+    host = URL(url).host or ""
+    breaker = get_breaker(host)
+
+    try:
+        breaker.before_request()
+    except CircuitOpenError:
+        metrics.inc("astro_http_requests_total", host=host, outcome="rejected")
+        raise
+
+    kwargs.setdefault("timeout", timeout_for(host))
+    ok: typing.Optional[bool] = None
+
+    try:
+        async with _host_semaphore(host) or contextlib.nullcontext(), session.request(
+            method, url, **kwargs
+        ) as resp:
+            ok = resp.status < 500 and resp.status != 429
+            yield resp
+    except aiohttp.ClientResponseError:
+        # raised by raise_for_status - the status above already decided this one
+        raise
+    except (asyncio.TimeoutError, aiohttp.ClientError):
+        ok = False
+        raise
+    except asyncio.CancelledError:
+        ok = None
+        raise
+    finally:
+        breaker.record(ok)
+        outcome = "cancelled" if ok is None else "ok" if ok else "error"
+        metrics.inc("astro_http_requests_total", host=host, outcome=outcome)
+
+
+# downloads that can't be bigger than this stay in memory, anything else goes to a temporary file
+SPOOL_SIZE = 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+
+async def download(session: aiohttp.ClientSession, url: str, max_size: int) -> typing.BinaryIO:
+    """
+    Streams the url into a file without ever holding more than `SPOOL_SIZE` of it in memory.
+    The file is rewound and ready to read, and it's up to the caller to close it.
+
+    Raises ValueError if the body turns out to be bigger than `max_size`.
+    """
+    # SpooledTemporaryFile isn't an IOBase before 3.11, so interactions.py won't upload it -
+    # the size cap tells us up front which of these two it would have ended up as anyways
+    file: typing.BinaryIO = (
+        io.BytesIO() if max_size <= SPOOL_SIZE else tempfile.TemporaryFile()  # type: ignore
+    )
+    size = 0
+
+    try:
+        async with request(session, "GET", url) as resp:
+            resp.raise_for_status()
+            async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_size:
+                    break
+                file.write(chunk)
+
+        # raised out here so the breaker doesn't blame the host for it
+        if size > max_size:
+            raise ValueError(f"{url} is bigger than {max_size} bytes.")
+    except BaseException:
+        file.close()
+        raise
+
+    file.seek(0)
+    return file
@@ -0,0 +1,362 @@
+import asyncio
+import hashlib
+import importlib
+import json
+import logging
+import os
+import re
+import time
+import typing
+from pathlib import Path
+
+import interactions as ipy
+from interactions.models.internal import application_commands
+
+import common.metrics as metrics
+import common.utils as utils
+from common.const import SRC_PATH
+
+__all__ = (
+    "MANIFEST_PATH",
+    "LAZY_EXTENSIONS",
+    "WARM_UP_DELAY",
+    "describe",
+    "LazyExtensions",
+)
+
+MANIFEST_PATH = Path(
+    os.environ.get("EXTENSIONS_MANIFEST_PATH", f"{SRC_PATH}/.cache/extensions.json")
+)
+# comma-separated extensions to load lazily, or * for all of them - empty means none
+LAZY_EXTENSIONS = frozenset(
+    name.strip() for name in os.environ.get("LAZY_EXTENSIONS", "").split(",") if name.strip()
+)
+# how long after startup to load whatever hasn't been used yet - negative means never
+WARM_UP_DELAY = float(os.environ.get("LAZY_WARM_UP_DELAY", 60))
+
+logger = logging.getLogger("astro_bot.lazy")
+
+
+def _source_hash(name: str) -> str:
+    path = Path(SRC_PATH, *name.split(".")).with_suffix(".py")
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _str(value: typing.Any) -> typing.Optional[str]:
+    # localised names and descriptions turn into plain strings - we don't use localisations
+    return str(value) if value else None
+
+
+def _describe_command(command: ipy.InteractionCommand) -> dict:
+    data = {
+        "name": str(command.name),
+        "scopes": [int(s) for s in command.scopes],
+        "default_member_permissions": (
+            int(command.default_member_permissions)
+            if command.default_member_permissions is not None
+            else None
+        ),
+        "dm_permission": command.dm_permission,
+        "nsfw": command.nsfw,
+        "integration_types": [int(t) for t in command.integration_types],
+        "contexts": [int(c) for c in command.contexts],
+    }
+
+    if isinstance(command, ipy.ContextMenu):
+        data["type"] = int(command.type)
+        return data
+
+    command = typing.cast(ipy.SlashCommand, command)
+    data.update(
+        type=int(ipy.CommandType.CHAT_INPUT),
+        description=_str(command.description),
+        group_name=_str(command.group_name),
+        group_description=_str(command.group_description),
+        sub_cmd_name=_str(command.sub_cmd_name),
+        sub_cmd_description=_str(command.sub_cmd_description),
+        options=[
+            o.to_dict() if isinstance(o, application_commands.SlashCommandOption) else dict(o)
+            for o in command.options or []
+        ],
+        # tansy registers the base of a group as a command with nothing to run
+        runnable=command.callback is not None,
+        autocomplete=list(command.autocomplete_callbacks),
+    )
+    return data
+
+
+def describe(bot: ipy.Client, name: str) -> typing.Optional[dict]:
+    """
+    Describes everything a loaded extension registers, so it can be stood in for later.
+
+    Returns `None` if the extension has something a stand-in can't cover,
+    like prefixed commands or regex component callbacks.
+    """
+    entry = {
+        "hash": _source_hash(name),
+        "commands": [],
+        "components": [],
+        "modals": [],
+        "listeners": [],
+    }
+
+    for ext in bot.get_extensions(name):
+        for command in ext.commands:
+            if isinstance(command, ipy.ComponentCommand):
+                if any(isinstance(listener, re.Pattern) for listener in command.listeners):
+                    return None
+                key = "modals" if isinstance(command, ipy.ModalCommand) else "components"
+                entry[key].extend(command.listeners)
+            elif isinstance(command, (ipy.SlashCommand, ipy.ContextMenu)):
+                entry["commands"].append(_describe_command(command))
+            else:
+                return None
+
+        entry["listeners"].extend(sorted({listener.event for listener in ext.listeners}))
+
+    return entry
+
+
+class LazyExtensions:
+    """
+    Stands in for extensions until they're actually needed.
+
+    Whenever an extension is loaded for real, what it registers is written to a manifest.
+    Next time around, extensions picked by `LAZY_EXTENSIONS` are registered from the
+    manifest instead, with callbacks that import and load the real extension the first
+    time any of them fire and then hand over to it. Until then, neither the module nor
+    the libraries it pulls in are imported. Whatever is left gets loaded in the
+    background `WARM_UP_DELAY` seconds after startup.
+
+    Extensions with no manifest entry, or whose source has changed since it was written,
+    are loaded normally.
+    """
+
+    def __init__(self, bot: ipy.Client, names: typing.Iterable[str] = LAZY_EXTENSIONS) -> None:
+        self.bot = bot
+        self.names = frozenset(names)
+
+        self.manifest = self._read_manifest()
+        self._dirty = False
+
+        self._stubs: dict[str, ipy.Extension] = {}
+        self._loading: dict[str, asyncio.Task] = {}
+        self._warm_up_task: typing.Optional[asyncio.Task] = None
+
+        metrics.gauge("astro_lazy_extensions_pending", lambda: len(self._stubs))
+
+    def _read_manifest(self) -> dict[str, typing.Optional[dict]]:
+        try:
+            with MANIFEST_PATH.open("r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+
+        MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = MANIFEST_PATH.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp_path, MANIFEST_PATH)
+        self._dirty = False
+
+    def can_stub(self, name: str) -> bool:
+        if "*" not in self.names and name not in self.names:
+            return False
+
+        entry = self.manifest.get(name)
+        try:
+            return entry is not None and entry["hash"] == _source_hash(name)
+        except OSError:
+            return False
+
+    def load(self, name: str) -> None:
+        """Loads an extension for real, and remembers what it registered for next time."""
+        self.bot.load_extension(name)
+        # every real load comes through here, so this is where handlers get timed
+        for ext in self.bot.get_extensions(name):
+            utils.instrument(ext)
+
+        entry = describe(self.bot, name)
+        if entry != self.manifest.get(name):
+            self.manifest[name] = entry
+            self._dirty = True
+
+    def stub(self, name: str) -> None:
+        """Registers stand-ins for everything in an extension from its manifest entry."""
+        entry = typing.cast(dict, self.manifest[name])
+
+        # the extension's name has to be unique, so each stub gets its own class
+        stub_cls = type(f"Lazy({name})", (ipy.Extension,), {})
+        stub = stub_cls(self.bot)
+
+        for data in entry["commands"]:
+            command = self._stub_command(name, data)
+            command.extension = stub
+            self.bot.add_command(command)
+            stub._commands.append(command)
+
+        for key, command_cls in (
+            ("components", ipy.ComponentCommand),
+            ("modals", ipy.ModalCommand),
+        ):
+            if not entry[key]:
+                continue
+
+            command = command_cls(
+                name=f"Lazy({name})::{key}",
+                callback=self._stub_component(name, key),
+                listeners=entry[key],
+            )
+            command.extension = stub
+            self.bot.add_command(command)
+            stub._commands.append(command)
+
+        for event in entry["listeners"]:
+            listener = ipy.Listener(self._stub_listener(name, event), event)
+            listener.extension = stub
+            self.bot.add_listener(listener)
+            stub._listeners.append(listener)
+
+        self._stubs[name] = stub
+
+    def _stub_command(self, name: str, data: dict) -> ipy.InteractionCommand:
+        kwargs = {
+            "name": data["name"],
+            "scopes": data["scopes"],
+            "default_member_permissions": (
+                ipy.Permissions(data["default_member_permissions"])
+                if data["default_member_permissions"] is not None
+                else None
+            ),
+            "dm_permission": data["dm_permission"],
+            "nsfw": data["nsfw"],
+            "integration_types": data["integration_types"],
+            "contexts": data["contexts"],
+        }
+
+        if data["type"] != ipy.CommandType.CHAT_INPUT:
+            return ipy.ContextMenu(
+                type=ipy.CommandType(data["type"]),
+                callback=self._stub_callback(name),
+                **kwargs,
+            )
+
+        command = ipy.SlashCommand(
+            description=data["description"],
+            group_name=data["group_name"],
+            group_description=data["group_description"],
+            sub_cmd_name=data["sub_cmd_name"],
+            sub_cmd_description=data["sub_cmd_description"],
+            options=data["options"],
+            callback=self._stub_callback(name) if data["runnable"] else None,
+            **kwargs,
+        )
+        command.autocomplete_callbacks = {
+            option: self._stub_autocomplete(name, option) for option in data["autocomplete"]
+        }
+        return command
+
+    def _stub_callback(self, name: str):
+        async def callback(ctx: ipy.InteractionContext, *_, **__):
+            await self.ensure_loaded(name, f"/{ctx.invoke_target}")
+
+            # the real command took over the name, so this finds it now
+            command = typing.cast(ipy.InteractionCommand, ctx.command)
+            return await self.bot._run_slash_command(command, ctx)  # type: ignore
+
+        return callback
+
+    def _stub_autocomplete(self, name: str, option: str):
+        async def callback(ctx: ipy.AutocompleteContext):
+            await self.ensure_loaded(name, f"/{ctx.invoke_target} autocomplete")
+
+            command = typing.cast(ipy.SlashCommand, ctx.command)
+            autocomplete = command.autocomplete_callbacks[option]
+            if command.has_binding:
+                return await command.call_with_binding(autocomplete, ctx)
+            return await autocomplete(ctx)
+
+        return callback
+
+    def _stub_component(self, name: str, key: str):
+        async def callback(ctx: ipy.ComponentContext | ipy.ModalContext):
+            await self.ensure_loaded(name, ctx.custom_id)
+
+            callbacks = (
+                self.bot._modal_callbacks if key == "modals" else self.bot._component_callbacks
+            )
+            return await callbacks[ctx.custom_id](ctx)
+
+        return callback
+
+    def _stub_listener(self, name: str, event_name: str):
+        async def callback(event: ipy.events.BaseEvent):
+            await self.ensure_loaded(name, event_name)
+
+            # anything after this point goes straight to the real listeners,
+            # but they weren't around for this one
+            for ext in self.bot.get_extensions(name):
+                for listener in ext.listeners:
+                    if listener.event != event_name:
+                        continue
+                    if listener.pass_event_object:
+                        await listener(event)
+                    else:
+                        await listener()
+
+        return callback
+
+    async def ensure_loaded(self, name: str, trigger: str) -> None:
+        """Swaps the stand-ins for the real extension, if that hasn't happened yet."""
+        if name not in self._stubs:
+            return
+
+        # everything that needs it while it's loading waits on the same load
+        if not (task := self._loading.get(name)):
+            task = self._loading[name] = asyncio.create_task(self._load(name, trigger))
+            task.add_done_callback(lambda _: self._loading.pop(name, None))
+        await asyncio.shield(task)
+
+    async def _load(self, name: str, trigger: str) -> None:
+        start = time.perf_counter()
+
+        # importing is the slow part, and it can happen off the event loop
+        await asyncio.to_thread(importlib.import_module, name)
+
+        # nothing can run between these, so no event or interaction falls in a gap
+        stub = self._stubs.pop(name)
+        stub.drop()
+        try:
+            self.load(name)
+        except Exception:
+            self.stub(name)
+            raise
+        finally:
+            self.save()
+
+        # the IDs discord gave us were put on the stand-ins, and commands are looked up by them
+        for command in stub.commands:
+            if isinstance(command, ipy.InteractionCommand):
+                for scope, command_id in command.cmd_id.items():
+                    self.bot.update_command_cache(scope, command.resolved_name, command_id)
+
+        metrics.inc("astro_lazy_loads_total", extension=name)
+        logger.info(f"Loaded {name} lazily in {time.perf_counter() - start:.2f}s for {trigger}.")
+
+    def start_warm_up(self, delay: float = WARM_UP_DELAY) -> None:
+        if delay >= 0 and self._stubs and not self._warm_up_task:
+            self._warm_up_task = asyncio.create_task(self._warm_up(delay))
+
+    async def _warm_up(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+
+        # one at a time, so this doesn't get in the way of anything
+        for name in list(self._stubs):
+            try:
+                await self.ensure_loaded(name, "warm-up")
+            except Exception:
+                logger.exception(f"Could not load {name} during warm-up.")
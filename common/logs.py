@@ -0,0 +1,95 @@
+import copy
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import typing
+
+import common.metrics as metrics
+
+__all__ = (
+    "LOG_FORMAT",
+    "LOG_MAX_BYTES",
+    "LOG_BACKUP_COUNT",
+    "LOG_QUEUE_SIZE",
+    "JSONFormatter",
+    "DroppingQueueHandler",
+    "start_queue_logging",
+)
+
+# "json" for one json object per line, anything else for plain text
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text").lower()
+LOG_MAX_BYTES = int(os.environ.get("LOG_MAX_BYTES", 10 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.environ.get("LOG_BACKUP_COUNT", 5))
+# records waiting on the writer past this are dropped rather than waited on
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", 10000))
+
+_traceback_formatter = logging.Formatter()
+
+
+class JSONFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, for anything that ships logs somewhere."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": datetime.datetime.fromtimestamp(
+                record.created, tz=datetime.timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exception"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """A queue handler that drops records once the queue is full, rather than blocking."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # the arguments and traceback might have changed by the time the writer gets to
+        # them, so they're baked in now - but separately, so the json format keeps them apart
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _traceback_formatter.formatException(
+                record.exc_info
+            )
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # losing a few lines in a flood beats stalling the event loop on the disk
+            metrics.inc("astro_log_records_dropped_total")
+
+
+def start_queue_logging(
+    logger: logging.Logger, handlers: typing.Sequence[logging.Handler]
+) -> logging.handlers.QueueListener:
+    """
+    Moves the given handlers onto a background thread, fed through a queue.
+
+    Only putting a record on the queue happens wherever it was logged, so slow disks (or
+    a lot of logging) don't hold up the caller. The returned listener has to be stopped
+    to flush whatever is left.
+    """
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(LOG_QUEUE_SIZE)
+    metrics.gauge("astro_log_queue_size", log_queue.qsize)
+
+    queue_handler = DroppingQueueHandler(log_queue)
+    # no point in formatting and queueing records that every handler would throw away
+    queue_handler.setLevel(min(handler.level for handler in handlers))
+    logger.addHandler(queue_handler)
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
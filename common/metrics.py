@@ -0,0 +1,179 @@
+import bisect
+import collections
+import math
+import typing
+
+from aiohttp import web
+
+__all__ = (
+    "Labels",
+    "DEFAULT_BUCKETS",
+    "Histogram",
+    "Registry",
+    "REGISTRY",
+    "inc",
+    "gauge",
+    "histogram",
+    "CONTENT_TYPE",
+    "serve",
+)
+
+Labels = tuple[tuple[str, str], ...]
+
+# in seconds - from "instant" up to "discord is about to give up on the interaction"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# what prometheus expects the text format to be served as
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _labels(labels: dict[str, typing.Any]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class Histogram:
+    """Counts observations into fixed buckets, plus their running count and sum."""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: typing.Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        # one per bucket, and one more for anything past the last
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        # buckets are upper bounds, so a value right on one belongs in it
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """Every bucket with how many observations were at or below it, ending with inf."""
+        total = 0
+        result = []
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q: float) -> float:
+        """Roughly the q-th quantile, going by the upper bound of the bucket it lands in."""
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                # there's nothing to go on past the last bucket, so that's the best we can say
+                return bound if bound != float("inf") else self.buckets[-1]
+        return self.buckets[-1]
+
+
+class Registry:
+    """A tiny in-process store of counters, gauges and histograms, keyed by name and labels."""
+
+    def __init__(self) -> None:
+        self.counters: dict[tuple[str, Labels], float] = collections.defaultdict(float)
+        # gauges are read lazily, so whatever owns the state doesn't need to push updates
+        self.gauges: dict[tuple[str, Labels], typing.Callable[[], float]] = {}
+        self.histograms: dict[tuple[str, Labels], Histogram] = {}
+
+    def inc(self, name: str, amount: float = 1.0, **labels: typing.Any) -> None:
+        self.counters[(name, _labels(labels))] += amount
+
+    def gauge(self, name: str, func: typing.Callable[[], float], **labels: typing.Any) -> None:
+        self.gauges[(name, _labels(labels))] = func
+
+    def histogram(
+        self, name: str, buckets: typing.Sequence[float] = DEFAULT_BUCKETS, **labels: typing.Any
+    ) -> Histogram:
+        # handing back the histogram itself lets hot paths skip the label lookup every time
+        key = (name, _labels(labels))
+        if not (hist := self.histograms.get(key)):
+            hist = self.histograms[key] = Histogram(buckets)
+        return hist
+
+    def collect(self) -> dict[tuple[str, Labels], float]:
+        values = dict(self.counters)
+        for key, func in self.gauges.items():
+            values[key] = float(func())
+        return values
+
+    def totals(self) -> dict[str, float]:
+        """Every counter and gauge, added up over all of its labels."""
+        totals: dict[str, float] = collections.defaultdict(float)
+        for (name, _), value in self.collect().items():
+            totals[name] += value
+        return totals
+
+    def render(self) -> str:
+        """Everything in the Prometheus text exposition format."""
+        families: dict[str, tuple[str, list[str]]] = {}
+
+        def family(name: str, kind: str) -> list[str]:
+            return families.setdefault(name, (kind, []))[1]
+
+        for (name, labels), value in self.counters.items():
+            family(name, "counter").append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for (name, labels), func in self.gauges.items():
+            value = float(func())
+            family(name, "gauge").append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for (name, labels), hist in self.histograms.items():
+            lines = family(name, "histogram")
+            for bound, total in hist.cumulative():
+                bucket_labels = (*labels, ("le", _format_value(bound)))
+                lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {total}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(hist.sum)}")
+            lines.append(f"{name}_count{_format_labels(labels)} {hist.count}")
+
+        output = []
+        for name in sorted(families):
+            kind, lines = families[name]
+            output.append(f"# TYPE {name} {kind}")
+            output.extend(lines)
+        return "\n".join(output) + "\n"
+
+
+REGISTRY = Registry()
+inc = REGISTRY.inc
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+
+
+async def serve(host: str, port: int, registry: Registry = REGISTRY) -> web.AppRunner:
+    """
+    Starts serving the registry over HTTP for Prometheus to scrape, on the running loop.
+
+    The returned runner has to be cleaned up to stop it.
+    """
+
+    async def handle(_: web.Request) -> web.Response:
+        return web.Response(body=registry.render().encode(), headers={"Content-Type": CONTENT_TYPE})
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+
+    # access logs for every scrape would just be noise
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
@@ -2,9 +2,10 @@ import enum
 import typing
 from datetime import datetime
 
+import pymongo
 from beanie import Document, Indexed
 
-__all__ = ("Tag",)
+__all__ = ("Tag", "HelpThread", "HelpStats", "RoleJobStatus", "RoleJob", "Report")
 
 
 class Tag(Document):
@@ -13,3 +14,66 @@ class Tag(Document):
     description: str
     created_at: datetime
     last_edited_at: typing.Optional[datetime] = None
+
+
+class HelpThread(Document):
+    thread_id: typing.Annotated[str, Indexed(str, unique=True)]
+    # for autogenerated threads, this is who asked rather than the bot
+    owner_id: typing.Annotated[str, Indexed(str)]
+    created_at: typing.Annotated[datetime, Indexed(datetime)]
+    tags: list[str] = []
+    first_response_at: typing.Optional[datetime] = None
+    first_responder_id: typing.Optional[str] = None
+    closed_at: typing.Optional[datetime] = None
+
+
+class HelpStats(Document):
+    # running totals, kept up to date as things happen so nothing has to scan every thread
+    name: typing.Annotated[str, Indexed(str, unique=True)]
+    created: int = 0
+    responded: int = 0
+    response_seconds: float = 0
+    closed: int = 0
+    close_seconds: float = 0
+    tag_counts: dict[str, int] = {}
+
+
+class RoleJobStatus(str, enum.Enum):
+    RUNNING = "running"
+    DONE = "done"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
+
+
+class RoleJob(Document):
+    role_id: str
+    add: bool
+    member_ids: list[str]
+    # everything before this has been processed, so it's where to pick up after a restart
+    position: int = 0
+    succeeded: int = 0
+    skipped: int = 0
+    failed: int = 0
+    status: typing.Annotated[RoleJobStatus, Indexed(str)] = RoleJobStatus.RUNNING
+    author_id: str
+    channel_id: str
+    message_id: typing.Optional[str] = None
+    created_at: datetime
+
+
+class Report(Document):
+    reported_id: str
+    reporter_id: str
+    reason: str
+    created_at: datetime
+
+    class Settings:
+        # lookups are always "the latest reports of/by someone"
+        indexes = [
+            pymongo.IndexModel(
+                [("reported_id", pymongo.ASCENDING), ("created_at", pymongo.DESCENDING)]
+            ),
+            pymongo.IndexModel(
+                [("reporter_id", pymongo.ASCENDING), ("created_at", pymongo.DESCENDING)]
+            ),
+        ]
@@ -0,0 +1,152 @@
+import asyncio
+import collections
+import logging
+import random
+import typing
+
+import aiohttp
+import interactions as ipy
+
+import common.metrics as metrics
+
+__all__ = ("retryable", "RetryQueue")
+
+logger = logging.getLogger("astro_bot.retry")
+
+
+def retryable(error: BaseException) -> bool:
+    # only rate limits, discord having a bad time and the connection dropping can go away
+    # on their own - anything else would just fail the same way again
+    if isinstance(error, ipy.errors.HTTPException):
+        return error.status == 429 or error.status >= 500
+    return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+class _Job(typing.NamedTuple):
+    func: typing.Callable[..., typing.Awaitable[typing.Any]]
+    args: tuple[typing.Any, ...]
+    kwargs: dict[str, typing.Any]
+    future: asyncio.Future
+    attempt: int
+    retry_on: typing.Callable[[BaseException], bool]
+    background: bool
+
+
+class RetryQueue:
+    """
+    Runs Discord writes on a few workers, retrying failures with jittered exponential backoff.
+
+    A job that fails is put back onto the queue after its delay instead of having something
+    sleep on it, so a burst of failures costs nothing but a timer each. `submit` returns
+    a future with the eventual result, or the last error once `max_attempts` is used up.
+
+    Jobs submitted with `background=True` always wait behind everything else, and `reserved`
+    of the workers never pick them up, so a big batch of them can't hold up anyone waiting
+    on a reply.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        reserved: int = 1,
+        max_attempts: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+    ) -> None:
+        self.workers = workers
+        self.reserved = reserved
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._jobs: collections.deque[_Job] = collections.deque()
+        self._background: collections.deque[_Job] = collections.deque()
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self._timers: set[asyncio.TimerHandle] = set()
+
+        metrics.gauge("astro_retry_queue_size", lambda: len(self._jobs) + len(self._background))
+        metrics.gauge("astro_retry_scheduled", lambda: len(self._timers))
+
+    def submit(
+        self,
+        func: typing.Callable[..., typing.Awaitable[typing.Any]],
+        *args: typing.Any,
+        retry_on: typing.Callable[[BaseException], bool] = retryable,
+        background: bool = False,
+        **kwargs: typing.Any,
+    ) -> asyncio.Future:
+        # workers need a running loop, so they're started the first time they're needed
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._worker(reserved=index < self.reserved))
+                for index in range(self.workers)
+            ]
+
+        future = asyncio.get_running_loop().create_future()
+        self._put(_Job(func, args, kwargs, future, 1, retry_on, background))
+        return future
+
+    def _put(self, job: _Job) -> None:
+        (self._background if job.background else self._jobs).append(job)
+        self._wakeup.set()
+
+    async def _next(self, reserved: bool) -> _Job:
+        while True:
+            if self._jobs:
+                return self._jobs.popleft()
+            if self._background and not reserved:
+                return self._background.popleft()
+
+            # anyone already waiting was woken by whatever set this, so clearing it loses nothing
+            self._wakeup.clear()
+            await self._wakeup.wait()
+
+    def delay_for(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        # half of it is random, so things that failed together don't retry together
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _schedule(self, job: _Job) -> None:
+        def put():
+            self._timers.discard(timer)
+            self._put(job)
+
+        timer = asyncio.get_running_loop().call_later(self.delay_for(job.attempt), put)
+        self._timers.add(timer)
+
+    async def _worker(self, reserved: bool) -> None:
+        while True:
+            job = await self._next(reserved)
+            if job.future.cancelled():
+                continue
+
+            try:
+                result = await job.func(*job.args, **job.kwargs)
+            except Exception as e:
+                if job.retry_on(e) and job.attempt < self.max_attempts:
+                    metrics.inc("astro_retry_attempts_total", outcome="retried")
+                    self._schedule(job._replace(attempt=job.attempt + 1))
+                    continue
+
+                metrics.inc("astro_retry_attempts_total", outcome="failed")
+                if job.attempt > 1:
+                    logger.warning(
+                        f"Giving up on {getattr(job.func, '__qualname__', job.func)} after"
+                        f" {job.attempt} attempts."
+                    )
+                if not job.future.cancelled():
+                    job.future.set_exception(e)
+            else:
+                metrics.inc("astro_retry_attempts_total", outcome="ok")
+                if not job.future.cancelled():
+                    job.future.set_result(result)
+
+    def close(self) -> None:
+        for timer in self._timers:
+            timer.cancel()
+        self._timers.clear()
+
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
@@ -0,0 +1,97 @@
+import asyncio
+import typing
+
+import interactions as ipy
+
+__all__ = ("RoleEditQueue",)
+
+
+class _Batch:
+    def __init__(self) -> None:
+        self.adds: set[int] = set()
+        self.removes: set[int] = set()
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class RoleEditQueue:
+    """
+    Merges role changes for the same member into a single PATCH.
+
+    Changes asked for within `delay` seconds of each other (or while the member's last
+    PATCH is still in flight) are folded together, and the final role list is worked out
+    from whatever Discord last told us the member had, so nothing gets lost to a race.
+    """
+
+    def __init__(self, bot: ipy.Client, delay: float = 0.5) -> None:
+        self.bot = bot
+        self.delay = delay
+
+        self._queued: dict[int, _Batch] = {}
+        self._inflight: dict[int, _Batch] = {}
+        self._locks: dict[int, asyncio.Lock] = {}
+
+    def has_role(self, member: ipy.Member, role_id: ipy.Snowflake_Type) -> bool:
+        """Whether the member has the role once everything pending for them goes through."""
+        role_id = int(role_id)
+        for batches in (self._queued, self._inflight):
+            if batch := batches.get(int(member.id)):
+                if role_id in batch.adds:
+                    return True
+                if role_id in batch.removes:
+                    return False
+        return member.has_role(role_id)
+
+    async def edit(
+        self,
+        member: ipy.Member,
+        add: typing.Iterable[ipy.Snowflake_Type] = (),
+        remove: typing.Iterable[ipy.Snowflake_Type] = (),
+        *,
+        reason: typing.Optional[str] = None,
+    ) -> None:
+        """Adds and removes roles, returning once the PATCH they ended up in is done."""
+        add = {int(r) for r in add}
+        remove = {int(r) for r in remove}
+
+        if not (batch := self._queued.get(int(member.id))):
+            batch = self._queued[int(member.id)] = _Batch()
+            asyncio.create_task(self._apply(member, reason))
+
+        # the latest change to a role wins
+        batch.adds = (batch.adds - remove) | add
+        batch.removes = (batch.removes - add) | remove
+
+        await asyncio.shield(batch.future)
+
+    async def _apply(self, member: ipy.Member, reason: typing.Optional[str]) -> None:
+        member_id = int(member.id)
+        await asyncio.sleep(self.delay)
+
+        if not (lock := self._locks.get(member_id)):
+            lock = self._locks[member_id] = asyncio.Lock()
+
+        async with lock:
+            # anything added while we were waiting for the lock is in here too
+            batch = self._queued.pop(member_id)
+            self._inflight[member_id] = batch
+
+            try:
+                # a newer copy of them may be in the cache, thanks to the last batch
+                member = self.bot.cache.get_member(member.guild.id, member_id) or member
+                roles = (set(member._role_ids) | batch.adds) - batch.removes
+                data = await self.bot.http.modify_guild_member(
+                    member.guild.id, member_id, roles=list(roles), reason=reason
+                )
+                # the response is the member as discord sees them now, which is what the
+                # next batch needs to build on - the gateway event might not be here yet
+                if data:
+                    self.bot.cache.place_member_data(member.guild.id, data)
+            except Exception as e:
+                batch.future.set_exception(e)
+            else:
+                batch.future.set_result(None)
+            finally:
+                del self._inflight[member_id]
+
+        if member_id not in self._queued and not lock.locked():
+            self._locks.pop(member_id, None)
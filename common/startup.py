@@ -0,0 +1,67 @@
+import asyncio
+import time
+import typing
+
+__all__ = ("PhaseRunner",)
+
+PhaseFunc = typing.Callable[[], typing.Awaitable[typing.Any]]
+
+
+class PhaseRunner:
+    """
+    Runs each startup phase as soon as the phases it depends on are done, timing all of them.
+
+    Phases that don't depend on each other run at the same time, so the whole thing
+    takes as long as its slowest chain rather than every phase added up.
+    """
+
+    def __init__(self, started_at: typing.Optional[float] = None) -> None:
+        self.started_at = time.perf_counter() if started_at is None else started_at
+        self.phases: dict[str, tuple[PhaseFunc, tuple[str, ...]]] = {}
+        # phase -> when it started and finished, relative to started_at
+        self.timings: dict[str, tuple[float, float]] = {}
+
+    def phase(
+        self, name: str, *, after: typing.Iterable[str] = ()
+    ) -> typing.Callable[[PhaseFunc], PhaseFunc]:
+        def wrapper(func: PhaseFunc) -> PhaseFunc:
+            self.phases[name] = (func, tuple(after))
+            return func
+
+        return wrapper
+
+    async def _run_phase(self, name: str, tasks: dict[str, asyncio.Task]) -> None:
+        func, after = self.phases[name]
+        await asyncio.gather(*(tasks[dependency] for dependency in after))
+
+        start = time.perf_counter()
+        try:
+            await func()
+        finally:
+            self.timings[name] = (start - self.started_at, time.perf_counter() - self.started_at)
+
+    async def run(self) -> None:
+        for name, (_, after) in self.phases.items():
+            if missing := [dependency for dependency in after if dependency not in self.phases]:
+                raise ValueError(f"Phase {name} depends on unknown phase(s): {', '.join(missing)}")
+
+        # the tasks don't start until we next yield, so they can all look each other up
+        tasks: dict[str, asyncio.Task] = {}
+        for name in self.phases:
+            tasks[name] = asyncio.create_task(self._run_phase(name, tasks))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+
+    def profile(self) -> str:
+        width = max((len(name) for name in self.timings), default=0)
+        lines = [
+            f"  {name:<{width}}  {start:6.2f}s -> {end:6.2f}s  ({end - start:.2f}s)"
+            for name, (start, end) in sorted(self.timings.items(), key=lambda item: item[1])
+        ]
+        total = max((end for _, end in self.timings.values()), default=0.0)
+        return "\n".join([f"Startup took {total:.2f}s:", *lines])
@@ -1,9 +1,40 @@
+import array
 import asyncio
+import bisect
+import heapq
+import html
+import importlib
+import json
+import logging
+import os
+import re
+import typing
+from pathlib import Path
 
 import aiohttp
 import interactions as ipy
 import lxml.etree as etree
 import tansy
+from rapidfuzz import fuzz, process
+
+import common.http as http
+import common.utils as utils
+from common.const import SRC_PATH
+
+DOCS_URL = "https://interactions-py.github.io/interactions.py/"
+SITEMAP_URL = f"{DOCS_URL}sitemap.xml"
+SEARCH_INDEX_URL = f"{DOCS_URL}search/search_index.json"
+CACHE_PATH = Path(os.environ.get("DOCS_CACHE_PATH", f"{SRC_PATH}/.cache/docs.json"))
+REFRESH_HOURS = float(os.environ.get("DOCS_REFRESH_HOURS", 6))
+# discord won't show more autocomplete choices than this
+MAX_CHOICES = 25
+
+NON_WORD_REGEX = re.compile(r"[\W_]+")
+WORD_REGEX = re.compile(r"\w+")
+CAMEL_CASE_REGEX = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+HTML_TAG_REGEX = re.compile(r"<[^>]+>")
+
+logger = logging.getLogger("astro_bot.docs")
 
 
 def url_encode(url: str):
@@ -25,26 +56,367 @@ def trim_base(url: str):
     return url.replace("%20", " ")
 
 
+def normalize(text: str):
+    """Lowercases text and turns anything that isn't a letter or number into single spaces"""
+    return NON_WORD_REGEX.sub(" ", text.replace("%20", " ").lower()).strip()
+
+
+class DocsIndex:
+    """A list of doc pages, with everything needed to search them worked out ahead of time."""
+
+    def __init__(self, pages: list[str], to_name: typing.Callable[[str], str]) -> None:
+        self.urls = pages
+        self.names = [to_name(page) for page in pages]
+        self.keys = [normalize(name) for name in self.names]
+        # everything in a folder has the folder's name in its path, so only this gets scored
+        self.page_keys = [normalize(name.strip("/").rsplit("/", 1)[-1]) for name in self.names]
+        self.encoded_urls = [url_encode(page) for page in pages]
+        self.by_key: dict[str, str] = {}
+        for key, url in zip(self.keys, self.urls):
+            self.by_key.setdefault(key, url)
+
+    def search(self, query: str, limit: int = 25) -> list[str]:
+        if not normalize(query):
+            return self.names[:limit]
+        # same goes for anyone typing out the whole path
+        query = normalize(query.strip("/").rsplit("/", 1)[-1])
+
+        # keys are already normalized, so rapidfuzz doesn't have to process anything
+        matches = process.extract(
+            query,
+            self.page_keys,
+            scorer=fuzz.WRatio,
+            processor=None,
+            limit=None,
+            score_cutoff=60,
+        )
+        # plenty of pages score the same, so exact matches, then prefixes, then shorter
+        # names win, rather than whichever came first in the sitemap
+        best = heapq.nsmallest(
+            limit,
+            matches,
+            key=lambda m: (-m[1], m[0] != query, not m[0].startswith(query), len(m[0]), m[2]),
+        )
+        return [self.names[index] for _, _, index in best]
+
+    def get(self, query: str) -> typing.Optional[str]:
+        # autocomplete gives us a name, so that should almost always hit
+        if url := self.by_key.get(normalize(query)):
+            return url
+
+        # otherwise, someone typed something themselves
+        encoded_query = url_encode(query)
+        return next(
+            (url for url, encoded in zip(self.urls, self.encoded_urls) if encoded_query in encoded),
+            None,
+        )
+
+
+def parse_sitemap(data: bytes) -> tuple[list[str], list[str]]:
+    """Splits the pages in the sitemap into guides and API references"""
+    tree = etree.fromstring(data)
+    namespaces = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
+    sitemap = [page.text for page in tree.findall(".//sm:loc", namespaces)]
+    guides = [p for p in sitemap if "/Guides/" in p]
+    api_ref = [p for p in sitemap if "/API%20Reference/" in p]
+    return guides, api_ref
+
+
+def symbol_tokens(name: str):
+    """Splits a symbol name into everything someone might start typing it with"""
+    tokens: set[str] = set()
+    for word in WORD_REGEX.findall(name):
+        tokens.add(word.lower())
+        for part in word.split("_"):
+            tokens.update(p.lower() for p in CAMEL_CASE_REGEX.findall(part))
+    tokens.discard("")
+    return tokens
+
+
+def parse_search_index(data: bytes) -> list[list[str]]:
+    """Turns mkdocs' search_index.json into a list of [name, page, anchor] entries"""
+    symbols: list[list[str]] = []
+    seen: set[tuple[str, str]] = set()
+
+    for doc in json.loads(data)["docs"]:
+        page, _, anchor = doc["location"].partition("#")
+        title = html.unescape(HTML_TAG_REGEX.sub("", doc.get("title") or "")).strip()
+
+        # mkdocstrings uses the import path of whatever it's documenting as the anchor,
+        # ie interactions.client.client.Client.wait_until_ready - we only want the
+        # Client.wait_until_ready part
+        if "." in anchor and " " not in anchor:
+            parts = anchor.split(".")
+            start = next((i for i, p in enumerate(parts) if p[:1].isupper()), len(parts) - 1)
+            name = ".".join(parts[start:])
+        else:
+            name = title
+
+        # a page and the class it documents usually share a title, so only keep the first
+        if name and (name, page) not in seen:
+            seen.add((name, page))
+            symbols.append([name, page, anchor])
+
+    return symbols
+
+
+class SymbolIndex:
+    """
+    A compact inverted index of every section in the docs, down to single methods.
+
+    Each token maps to a sorted array of entry ids. The last token of a query is matched
+    as a prefix (through a binary search of the sorted vocabulary), every other one
+    exactly, and the entries all of them point to are ranked by how close they are.
+    """
+
+    def __init__(self, symbols: list[list[str]]) -> None:
+        self.names: list[str] = []
+        self.anchors: list[str] = []
+        self.pages: list[str] = []
+        self.page_ids = array.array("I")
+        self.by_anchor: dict[str, int] = {}
+
+        page_ids: dict[str, int] = {}
+        postings: dict[str, array.array] = {}
+
+        for entry_id, (name, page, anchor) in enumerate(symbols):
+            self.names.append(name)
+            self.anchors.append(anchor)
+
+            if (page_id := page_ids.get(page)) is None:
+                page_id = page_ids[page] = len(self.pages)
+                self.pages.append(page)
+            self.page_ids.append(page_id)
+
+            if anchor:
+                self.by_anchor.setdefault(anchor, entry_id)
+
+            for token in symbol_tokens(name):
+                postings.setdefault(token, array.array("I")).append(entry_id)
+
+        self.vocab = sorted(postings)
+        self.postings = [postings[token] for token in self.vocab]
+
+        # a single letter matches a good chunk of the docs, and it's what autocomplete
+        # asks about first - so those answers are worked out once, here
+        self.by_letter: dict[str, list[int]] = {
+            letter: self._ranked(self._prefixed(letter), letter, letter, MAX_CHOICES)
+            for letter in {token[0] for token in self.vocab}
+        }
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def url(self, entry_id: int) -> str:
+        url = f"{DOCS_URL}{self.pages[self.page_ids[entry_id]]}"
+        if anchor := self.anchors[entry_id]:
+            url += f"#{anchor}"
+        return url
+
+    def _exact(self, token: str) -> set[int]:
+        index = bisect.bisect_left(self.vocab, token)
+        if index < len(self.vocab) and self.vocab[index] == token:
+            return set(self.postings[index])
+        return set()
+
+    def _prefixed(self, token: str) -> set[int]:
+        ids: set[int] = set()
+        index = bisect.bisect_left(self.vocab, token)
+        while index < len(self.vocab) and self.vocab[index].startswith(token):
+            ids.update(self.postings[index])
+            index += 1
+        return ids
+
+    def _ranked(self, matches: set[int], query: str, last_token: str, limit: int) -> list[int]:
+        # exact names first, then names whose last part starts with what's being
+        # typed, then the shortest (which tend to be the classes themselves)
+        def rank(entry_id: int):
+            name = self.names[entry_id].lower()
+            return (
+                name != query,
+                not name.rpartition(".")[2].startswith(last_token),
+                len(name),
+                name,
+            )
+
+        return heapq.nsmallest(limit, matches, key=rank)
+
+    def search(self, query: str, limit: int = MAX_CHOICES) -> list[int]:
+        if not (tokens := WORD_REGEX.findall(query.lower())):
+            return []
+
+        last_token = tokens[-1]
+        if len(tokens) == 1 and len(last_token) == 1 and limit <= MAX_CHOICES:
+            return self.by_letter.get(last_token, [])[:limit]
+
+        matches: typing.Optional[set[int]] = None
+        for token in tokens[:-1]:
+            ids = self._exact(token)
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                return []
+
+        ids = self._prefixed(last_token)
+        matches = ids if matches is None else matches & ids
+
+        return self._ranked(matches, query.strip().lower(), last_token, limit)
+
+    def choices(self, query: str) -> list[dict[str, str]]:
+        # choice values are capped at 100 characters, and almost all anchors fit
+        return [
+            {
+                "name": self.names[i][:100],
+                "value": a if (a := self.anchors[i]) and len(a) <= 100 else self.names[i][:100],
+            }
+            for i in self.search(query)
+        ]
+
+    def get(self, query: str) -> typing.Optional[str]:
+        if (entry_id := self.by_anchor.get(query)) is not None:
+            return self.url(entry_id)
+        if results := self.search(query, limit=1):
+            return self.url(results[0])
+        return None
+
+
+def read_cache() -> dict:
+    try:
+        with CACHE_PATH.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_cache(cache: dict):
+    # write to a temporary file first so a crash halfway through can't leave a broken cache
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = CACHE_PATH.with_suffix(".tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, CACHE_PATH)
+
+
 class DocsCommands(ipy.Extension):
     def __init__(self, bot: ipy.Client):
         self.session: aiohttp.ClientSession = bot.session
-        self.guides: list[str] = []
-        self.search_index: list[dict] = []
-        self.search_fields: dict[str, str] = {}
-        asyncio.create_task(self.fetch_docs_data())
-
-    async def fetch_docs_data(self):
-        # Fetch the sitemap
-        xml = await self.session.get(
-            "https://interactions-py.github.io/interactions.py/sitemap.xml"
-        )
-        # parse the XML
-        tree = etree.fromstring(await xml.read())
-        namespaces = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
-        sitemap = [page.text for page in tree.findall(".//sm:loc", namespaces)]
-        # Filter the sitemap into subsections
-        self.guides = [p for p in sitemap if "/Guides/" in p]
-        self.api_ref = [p for p in sitemap if "/API%20Reference/" in p]
+
+        # whatever we had last time is almost certainly still right, so use it
+        # straight away and check if it's stale in the background
+        self.cache = read_cache()
+        self.guides: list[str] = self.cache.get("sitemap", {}).get("guides", [])
+        self.api_ref: list[str] = self.cache.get("sitemap", {}).get("api_ref", [])
+        self.build_indexes()
+        self.search_index = SymbolIndex(self.cache.get("search_index", {}).get("symbols", []))
+
+        # the docs get new guides every now and then, so check for them every so often
+        self.refresh_lock = asyncio.Lock()
+        self.refresh_task = ipy.Task(self.refresh, ipy.IntervalTrigger(hours=REFRESH_HOURS))
+        self.refresh_task.start()
+        asyncio.create_task(self.refresh())
+
+    def drop(self):
+        self.refresh_task.stop()
+        super().drop()
+
+    async def conditional_fetch(
+        self, url: str, key: str, force: bool = False
+    ) -> typing.Optional[tuple[bytes, dict[str, typing.Optional[str]]]]:
+        """
+        Fetches the url, unless what's cached under the key is still up to date.
+        Returns None if it was, or if it couldn't be fetched, and otherwise the data
+        and the validators to store once it's been parsed successfully.
+
+        `force` fetches it regardless, in case what's cached is what's wrong.
+        """
+        cached: dict = {} if force else self.cache.get(key, {})
+        headers = {}
+        if etag := cached.get("etag"):
+            headers["If-None-Match"] = etag
+        if last_modified := cached.get("last_modified"):
+            headers["If-Modified-Since"] = last_modified
+
+        try:
+            async with http.request(self.session, "GET", url, headers=headers) as resp:
+                if resp.status == 304:
+                    return None
+                resp.raise_for_status()
+                data = await resp.read()
+        except (asyncio.TimeoutError, aiohttp.ClientError):
+            logger.warning(f"Could not fetch {url}, keeping cached data.", exc_info=True)
+            return None
+
+        validators = {
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+        }
+        return data, validators
+
+    async def refresh(self, force: bool = False) -> bool:
+        """Checks for new docs, returning if anything changed."""
+        async with self.refresh_lock:
+            updated = await asyncio.gather(
+                self.fetch_sitemap(force), self.fetch_search_index(force)
+            )
+            if not any(updated):
+                return False
+
+            try:
+                await asyncio.to_thread(write_cache, self.cache)
+            except OSError:
+                logger.warning("Could not write the docs cache.", exc_info=True)
+            return True
+
+    async def fetch_sitemap(self, force: bool = False) -> bool:
+        if not (fetched := await self.conditional_fetch(SITEMAP_URL, "sitemap", force)):
+            return False
+        data, validators = fetched
+
+        # everything is built off to the side, away from the event loop...
+        def build():
+            guides, api_ref = parse_sitemap(data)
+            return (
+                guides,
+                api_ref,
+                DocsIndex(guides, url_to_page_name),
+                DocsIndex(api_ref, trim_base),
+            )
+
+        try:
+            guides, api_ref, guide_index, api_index = await asyncio.to_thread(build)
+        except etree.XMLSyntaxError:
+            logger.warning("Could not parse the docs sitemap.", exc_info=True)
+            return False
+
+        # ...and then swapped in all at once. nothing can run in between these
+        # assignments, so commands only ever see a complete index
+        self.guides, self.api_ref = guides, api_ref
+        self.guide_index, self.api_index = guide_index, api_index
+
+        self.cache["sitemap"] = validators | {"guides": guides, "api_ref": api_ref}
+        return True
+
+    async def fetch_search_index(self, force: bool = False) -> bool:
+        if not (fetched := await self.conditional_fetch(SEARCH_INDEX_URL, "search_index", force)):
+            return False
+        data, validators = fetched
+
+        # the search index is a few megabytes of json, so keep it off of the event loop
+        def build():
+            symbols = parse_search_index(data)
+            return symbols, SymbolIndex(symbols)
+
+        try:
+            symbols, self.search_index = await asyncio.to_thread(build)
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Could not parse the docs search index.", exc_info=True)
+            return False
+
+        self.cache["search_index"] = validators | {"symbols": symbols}
+        return True
+
+    def build_indexes(self):
+        self.guide_index = DocsIndex(self.guides, url_to_page_name)
+        self.api_index = DocsIndex(self.api_ref, trim_base)
 
     docs = tansy.SlashCommand(name="docs")
 
@@ -54,21 +426,14 @@ class DocsCommands(ipy.Extension):
         ctx: ipy.SlashContext,
         query: str = tansy.Option("The page to search for.", autocomplete=True),
     ):
-        for page in self.guides:
-            if url_encode(query) in url_encode(page):
-                await ctx.send(page)
-                return
+        if page := self.guide_index.get(query):
+            await ctx.send(page)
+            return
         raise ipy.errors.BadArgument("Guide not found.")
 
     @guide.autocomplete("query")
     async def guide_autocomplete(self, ctx: ipy.AutocompleteContext):
-        await ctx.send(
-            [
-                url_to_page_name(page)
-                for page in self.guides
-                if url_encode(ctx.input_text) in url_encode(page)
-            ]
-        )
+        await ctx.send(self.guide_index.search(ctx.input_text))
 
     @docs.subcommand(
         "api", sub_cmd_description="Pull up an API Reference in the interactions.py docs."
@@ -78,18 +443,54 @@ class DocsCommands(ipy.Extension):
         ctx: ipy.SlashContext,
         query: str = tansy.Option("The page to search for.", autocomplete=True),
     ):
-        for page in self.api_ref:
-            if url_encode(query) in url_encode(page):
-                await ctx.send(page)
-                return
+        if page := self.api_index.get(query):
+            await ctx.send(page)
+            return
         raise ipy.errors.BadArgument("API Reference not found.")
 
     @api.autocomplete("query")
     async def api_autocomplete(self, ctx: ipy.AutocompleteContext):
+        await ctx.send(self.api_index.search(ctx.input_text))
+
+    @docs.subcommand(
+        "search",
+        sub_cmd_description="Search for a class, method or attribute in the interactions.py docs.",
+    )
+    async def search(
+        self,
+        ctx: ipy.SlashContext,
+        query: str = tansy.Option(
+            "What to search for, like Client.wait_until_ready.", autocomplete=True
+        ),
+    ):
+        if url := self.search_index.get(query):
+            await ctx.send(url)
+            return
+        raise ipy.errors.BadArgument("Nothing in the docs matched that.")
+
+    @search.autocomplete("query")
+    async def search_autocomplete(self, ctx: ipy.AutocompleteContext):
+        await ctx.send(self.search_index.choices(ctx.input_text))
+
+    @docs.subcommand("refresh", sub_cmd_description="Check the docs for new pages right now.")
+    @utils.mods_only()
+    async def refresh_docs(self, ctx: ipy.SlashContext):
+        await ctx.defer(ephemeral=True)
+
+        # skipping the validators means a cache that's gone bad gets replaced too
+        if not await self.refresh(force=True):
+            await ctx.send(":x: Could not refresh the docs. Check the logs.", ephemeral=True)
+            return
+
         await ctx.send(
-            [
-                trim_base(page)
-                for page in self.api_ref
-                if url_encode(ctx.input_text) in url_encode(page)
-            ][:25]
+            (
+                f":white_check_mark: Refreshed the docs: {len(self.guides)} guides,"
+                f" {len(self.api_ref)} API references and {len(self.search_index)} symbols."
+            ),
+            ephemeral=True,
         )
+
+
+def setup(bot):
+    importlib.reload(utils)
+    DocsCommands(bot)
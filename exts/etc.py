@@ -1,15 +1,50 @@
+import asyncio
+import base64
+import binascii
 import importlib
 import re
 from contextlib import suppress
 
+import aiohttp
 import interactions as ipy
 from interactions.ext import prefixed_commands as prefixed
 
+import common.command_sync as command_sync
+import common.http as http
+import common.metrics as metrics
 import common.utils as utils
 from common.const import *
 
 TOKEN_REG = re.compile(r"[a-zA-Z0-9_-]{23,28}\.[a-zA-Z0-9_-]{6,7}\.[a-zA-Z0-9_-]{27,}")
 
+TEXT_ATTACHMENT_EXTENSIONS = (".py", ".txt", ".log")
+# only this much of an attachment is ever read - tokens are usually near the top anyways
+MAX_SCANNED_SIZE = 256 * 1024
+# longer than any token, so one split between two chunks still gets found
+TOKEN_OVERLAP = 128
+
+
+def is_token(candidate: str):
+    # the first part of a token is the bot's user id in base64, which random
+    # strings that happen to look like a token almost never are
+    segment = candidate.split(".", 1)[0]
+
+    # the regex can start a match early if there's no space before the token,
+    # so try each length the user id part could be
+    for length in range(len(segment), 22, -1):
+        user_id = segment[-length:]
+        try:
+            decoded = base64.urlsafe_b64decode(user_id + "=" * (-len(user_id) % 4))
+        except (binascii.Error, ValueError):
+            continue
+        if decoded.isdigit() and 15 <= len(decoded) <= 20:
+            return True
+    return False
+
+
+def contains_token(text: str):
+    return any(is_token(match.group()) for match in TOKEN_REG.finditer(text))
+
 
 async def mod_check_wrapper(ctx: ipy.BaseContext) -> bool:
     return utils.mod_check(ctx)
@@ -18,25 +53,144 @@ async def mod_check_wrapper(ctx: ipy.BaseContext) -> bool:
 class Etc(ipy.Extension):
     def __init__(self, bot: ipy.Client):
         self.bot = bot
+        self.session: aiohttp.ClientSession = bot.session
 
     @prefixed.prefixed_command()
     @ipy.check(mod_check_wrapper)
-    async def sync(self, ctx: prefixed.PrefixedContext):
-        await self.bot.synchronise_interactions(scopes=[METADATA["guild"], 0], delete_commands=True)
-        await ctx.reply(":white_check_mark: Synchronized commands.")
+    async def sync(self, ctx: prefixed.PrefixedContext, mode: str = "diff"):
+        # diff: show what would change, apply: change it, refresh: forget what we think
+        # discord has and diff again, full: the old way of overwriting everything
+        scopes = [METADATA["guild"], 0]
+
+        if mode == "full":
+            await self.bot.synchronise_interactions(scopes=scopes, delete_commands=True)
+            command_sync.clear_cache()  # we don't know the new ids
+            await ctx.reply(":white_check_mark: Synchronized commands.")
+            return
+
+        if mode == "refresh":
+            command_sync.clear_cache()
+
+        changes = await command_sync.plan(self.bot, scopes)
+        if mode != "apply" or not changes:
+            await ctx.reply(command_sync.format_plan(changes))
+            return
+
+        await command_sync.apply(self.bot, changes)
+        await ctx.reply(f":white_check_mark: Synchronized {len(changes)} command(s).")
+
+    @ipy.slash_command(
+        "stats",
+        description="Shows how the bot has been doing since it started.",
+        default_member_permissions=ipy.Permissions.MODERATE_MEMBERS,
+    )
+    @utils.mods_only()
+    async def stats(self, ctx: ipy.InteractionContext):
+        # the same numbers the metrics endpoint serves, boiled down
+        handlers = [
+            (dict(labels)["handler"], hist)
+            for (name, labels), hist in metrics.REGISTRY.histograms.items()
+            if name == "astro_handler_seconds" and hist.count
+        ]
+        totals = metrics.REGISTRY.totals()
+
+        embed = ipy.Embed(title="Bot Stats", color=ASTRO_COLOR)
+        embed.add_field("Handled", str(sum(hist.count for _, hist in handlers)), inline=True)
+        embed.add_field(
+            "Errors", str(int(totals.pop("astro_handler_errors_total", 0))), inline=True
+        )
+        embed.add_field(
+            "Running Now", str(int(totals.pop("astro_handler_in_flight", 0))), inline=True
+        )
+
+        slowest = sorted(handlers, key=lambda item: item[1].quantile(0.95), reverse=True)[:5]
+        embed.add_field(
+            "Slowest (p95)",
+            "\n".join(
+                f"`{handler}`: up to {hist.quantile(0.95) * 1000:.0f} ms ({hist.count} calls)"
+                for handler, hist in slowest
+            )
+            or "N/A",
+        )
+
+        busiest = sorted(handlers, key=lambda item: item[1].count, reverse=True)[:5]
+        embed.add_field(
+            "Busiest",
+            "\n".join(
+                f"`{handler}`: {hist.count} calls, {hist.sum / hist.count * 1000:.0f} ms on average"
+                for handler, hist in busiest
+            )
+            or "N/A",
+        )
+
+        other = "\n".join(f"`{name}`: {value:g}" for name, value in sorted(totals.items()))
+        if len(other) > 1024:  # fields can only be so long
+            other = other[:1024].rsplit("\n", 1)[0]
+        embed.add_field("Everything Else", other or "N/A")
+
+        await ctx.send(embed=embed, ephemeral=True)
+
+    async def attachment_has_token(self, attachment: ipy.Attachment):
+        tail = ""
+        read = 0
+
+        async with http.request(self.session, "GET", attachment.url) as resp:
+            resp.raise_for_status()
+            async for chunk in resp.content.iter_chunked(http.CHUNK_SIZE):
+                # tokens are plain ascii, and latin-1 can't choke on a character split
+                # between two chunks like utf-8 could
+                text = tail + chunk.decode("latin-1")
+                if contains_token(text):
+                    return True
+
+                tail = text[-TOKEN_OVERLAP:]
+                read += len(chunk)
+                if read >= MAX_SCANNED_SIZE:
+                    break
+
+        return False
+
+    async def has_token(self, message: ipy.Message, scan_attachments: bool = True):
+        if message.content and contains_token(message.content):
+            return True
+
+        attachments = [
+            a
+            for a in message.attachments
+            if a.filename.lower().endswith(TEXT_ATTACHMENT_EXTENSIONS)
+        ]
+        if not scan_attachments or not attachments:
+            return False
+
+        results = await asyncio.gather(
+            *(self.attachment_has_token(a) for a in attachments), return_exceptions=True
+        )
+        return any(result is True for result in results)
+
+    async def handle_token_leak(self, message: ipy.Message):
+        await message.reply(
+            "Careful with your token! It looks like you leaked it. :eyes:",
+            delete_after=30,
+        )
+        with suppress(ipy.errors.Forbidden, ipy.errors.NotFound):
+            await message.delete()
 
     @ipy.listen()
     async def on_message_create(self, event: ipy.events.MessageCreate):
-        message = event.message
-        if message.content and TOKEN_REG.search(message.content):
-            await message.reply(
-                "Careful with your token! It looks like you leaked it. :eyes:",
-                delete_after=30,
-            )
-            with suppress(ipy.errors.Forbidden, ipy.errors.NotFound):
-                await message.delete()
+        if await self.has_token(event.message):
+            await self.handle_token_leak(event.message)
+
+    @ipy.listen()
+    async def on_message_update(self, event: ipy.events.MessageUpdate):
+        # embeds loading in trigger this too, and attachments can't be added in an edit,
+        # so only changed content needs a look
+        if event.before and event.before.content == event.after.content:
+            return
+        if await self.has_token(event.after, scan_attachments=False):
+            await self.handle_token_leak(event.after)
 
 
 def setup(bot: ipy.Client):
     importlib.reload(utils)
+    importlib.reload(command_sync)
     Etc(bot)
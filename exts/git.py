@@ -1,17 +1,21 @@
 import asyncio
-import contextlib
+import importlib
+import itertools
 import re
 import textwrap
+import typing
 
 import aiohttp
 import githubkit
 import interactions as ipy
 import unidiff
 from githubkit.exception import RequestFailed
-from githubkit.rest import Issue
+from githubkit.rest import GitCommit, Issue
 from interactions.ext import paginators
 from interactions.ext import prefixed_commands as prefixed
 
+import common.http as http
+import common.utils as utils
 from common.const import ASTRO_COLOR
 
 GH_SNIPPET_REGEX = re.compile(
@@ -19,10 +23,8 @@ GH_SNIPPET_REGEX = re.compile(
 )
 GH_COMMIT_REGEX = re.compile(r"https?://github\.com/(\S+)/(\S+)/commit/([0-9a-fA-F]{,40})")
 TAG_REGEX = re.compile(r"(?:\s|^)#(\d{1,5})")
-CODEBLOCK_REGEX = re.compile(r"```([^```]*)```")
 IMAGE_REGEX = re.compile(r"!\[.+\]\(.+\)")
 COMMENT_REGEX = re.compile(r"<!--(.*)-->")
-EXCESS_NEW_LINE_REGEX = re.compile(r"(\n[\t\r ]*){3,}")
 
 
 class GitPaginator(paginators.Paginator):
@@ -79,16 +81,131 @@ class Git(ipy.Extension):
         self.gh_client = githubkit.GitHub()
         self.session: aiohttp.ClientSession = bot.session
 
+        # links to the same issue/file/commit tend to get posted in bursts, so
+        # make sure we only ever have one request in flight for each of them
+        self.inflight = utils.SingleFlight()
+
+    def _clean_line(self, line: str) -> str:
+        if "### Pull-Request specification" in line:
+            line = line.replace("### Pull-Request specification", "")
+        if "[" in line:
+            line = line.replace("[ ]", "❌").replace("[x]", "✅").replace("[X]", "✅")
+            if "![" in line:
+                line = IMAGE_REGEX.sub(string=line, repl="`[IMAGE]`")
+        if "<!--" in line:
+            line = COMMENT_REGEX.sub(string=line, repl="")
+        return line
+
+    def _logical_lines(self, content: str) -> typing.Iterator[str]:
+        # walks through the content once, line by line, folding codeblocks (and comments
+        # that span multiple lines) into the line they started on as it goes
+        # we always know where the next ``` and <!-- are, so searching for the end of
+        # one jumps straight to it, and nothing is ever read twice
+        pos = 0
+        length = len(content)
+        pieces: list[str] = []
+
+        next_fence = content.find("```")
+        next_comment = content.find("<!--")
+
+        while pos <= length:
+            if next_fence != -1 and next_fence < pos:
+                next_fence = content.find("```", pos)
+            if next_comment != -1 and next_comment < pos:
+                next_comment = content.find("<!--", pos)
+
+            if not pieces:
+                # every line before the one with the next ``` or <!-- is plain text,
+                # so they can all be split off in one go
+                special = min((p for p in (next_fence, next_comment) if p != -1), default=-1)
+                if special == -1:
+                    yield from content[pos:].split("\n")
+                    return
+
+                if (line_start := content.rfind("\n", pos, special)) != -1:
+                    yield from content[pos:line_start].split("\n")
+                    pos = line_start + 1
+
+            line_end = content.find("\n", pos)
+            if line_end == -1:
+                line_end = length
+
+            # codeblocks take priority, same as they always have
+            # unlike a [^`] regex, this doesn't care about stray backticks inside the block
+            if next_fence != -1 and next_fence < line_end:
+                if (close := content.find("```", next_fence + 3)) != -1:
+                    pieces.append(content[pos:next_fence])
+                    pieces.append("`[CODEBLOCK]`")
+                    pos = close + 3
+                    continue
+
+                next_fence = -1  # nothing after it can close it, so there are no more blocks
+
+            # comments that start and end on the same line are left to _clean_line
+            if (
+                next_comment != -1
+                and next_comment < line_end
+                and content.find("-->", next_comment + 4, line_end) == -1
+                and (close := content.find("-->", next_comment + 4)) != -1
+            ):
+                pieces.append(content[pos:next_comment])
+                pos = close + 3
+                continue
+
+            pieces.append(content[pos:line_end])
+            yield "".join(pieces)
+            pieces.clear()
+            pos = line_end + 1
+
+    def iter_clean_lines(self, content: str) -> typing.Iterator[str]:
+        """Lazily yields the lines of clean_content, so callers can stop early."""
+        held: typing.Optional[str] = None
+        blanks: list[str] = []
+
+        for line in self._logical_lines(content):
+            line = self._clean_line(line)
+
+            if not line.strip():
+                if held is not None:  # leading blank lines get stripped
+                    blanks.append(line)
+                continue
+
+            if held is None:
+                held = line.lstrip()
+                continue
+
+            yield held
+
+            # two or more blank lines in a row become one empty line, and take the
+            # indentation of whatever comes after them with them
+            run: list[str] = []
+            for blank in blanks:
+                if blank.strip("\t\r "):
+                    if len(run) >= 2:
+                        yield ""
+                        blank = blank.lstrip("\t\r ")
+                    else:
+                        yield from run
+                    run = []
+                    yield blank
+                else:
+                    run.append(blank)
+
+            if len(run) >= 2:
+                yield ""
+                line = line.lstrip("\t\r ")
+            else:
+                yield from run
+
+            blanks.clear()
+            held = line
+
+        # trailing blank lines get stripped too
+        if held is not None:
+            yield held.rstrip()
+
     def clean_content(self, content: str) -> str:
-        content = content.replace("### Pull-Request specification", "")
-        content = content.replace("[ ]", "❌")
-        content = content.replace("[x]", "✅")
-        content = content.replace("[X]", "✅")
-        content = CODEBLOCK_REGEX.sub(string=content, repl="`[CODEBLOCK]`")
-        content = IMAGE_REGEX.sub(string=content, repl="`[IMAGE]`")
-        content = COMMENT_REGEX.sub(string=content, repl="")
-        content = EXCESS_NEW_LINE_REGEX.sub(string=content, repl="\n\n")
-        return content.strip()
+        return "\n".join(self.iter_clean_lines(content))
 
     def get_color(self, issue: Issue):
         if issue.state == "open":
@@ -126,11 +243,11 @@ class Git(ipy.Extension):
         if issue.user:
             embed.set_footer(text=issue.user.login, icon_url=issue.user.avatar_url)
 
-        body = self.clean_content(issue.body or "No description")
         new_body = []
 
         # make all headers bold instead
-        for line in body.split("\n"):  # purposely using \n for consistency
+        # we only ever show 7 lines, so there's no point cleaning past the 8th
+        for line in itertools.islice(self.iter_clean_lines(issue.body or "No description"), 8):
             if line.startswith("#"):
                 # ideal format: ## title
                 space_split = line.split(" ", 1)
@@ -154,8 +271,8 @@ class Git(ipy.Extension):
         if issue.user:
             embed.set_footer(text=issue.user.login, icon_url=issue.user.avatar_url, )
 
-        body = self.clean_content(issue.body or "No description")
-        line_split = body.split("\n")  # purposely using \n for consistency
+        # an empty body still needs to turn into an (empty) description
+        line_split = list(self.iter_clean_lines(issue.body or "No description")) or [""]
         line_iter = CustomStrIterator(line_split)  # we need to go back and forward at will
 
         # essentially, what we're trying to do is get each "part" of the pr
@@ -257,55 +374,41 @@ class Git(ipy.Extension):
 
         return embed
 
-    async def resolve_issue_num(self, message: ipy.Message, issue_num: int):
+    async def _fetch_issue(self, issue_num: int) -> Issue | None:
         try:
             resp = await self.gh_client.rest.issues.async_get(self.owner, self.repo, issue_num)
         except RequestFailed:
-            return
-
-        issue = resp.parsed_data
-
-        if issue.pull_request:
-            embed = self.prepare_pr(issue)
-        else:
-            embed = self.prepare_issue(issue)
-
-        await message.reply(embeds=embed)
-
-    async def resolve_gh_snippet(self, message: ipy.Message):
-        # heavily inspired and slightly stolen from
-        # https://github.com/NAFTeam/NAFB/blob/0460e8d2cada81e39909198ba3d84fa25f174e1a/scales/githubMessages.py#L203-L241
-        # NAFB under MIT License, owner LordOfPolls
-
-        results = GH_SNIPPET_REGEX.search(message.content)
-
-        if not results:
-            return
-
-        owner = results[1]
-        repo = results[2]
-        ref = results[3]
-        file_path = results[4]
-        extension = ".".join(file_path.split(".")[1:])
+            return None
+        return resp.parsed_data
 
-        start_line_num = int(results[5]) if results.end() > 3 and results[5] else 0
-        end_line_num = int(results[6]) if results.end() > 4 and results[6] else -1
+    async def fetch_issue(self, issue_num: int) -> Issue | None:
+        return await self.inflight.do(
+            ("issue", self.owner, self.repo, issue_num), self._fetch_issue, issue_num
+        )
 
-        if end_line_num != -1:
-            # i dont even know
-            end_line_num += 1
+    async def _fetch_commit(self, owner: str, repo: str, commit_hash: str) -> GitCommit | None:
+        try:
+            resp = await self.gh_client.rest.git.async_get_commit(owner, repo, commit_hash)
+        except RequestFailed:
+            return None
+        return resp.parsed_data
 
-        if end_line_num != -1 and start_line_num > end_line_num:
-            return
+    async def fetch_commit(self, owner: str, repo: str, commit_hash: str) -> GitCommit | None:
+        return await self.inflight.do(
+            ("commit", owner, repo, commit_hash), self._fetch_commit, owner, repo, commit_hash
+        )
 
-        if end_line_num == -1 and start_line_num > 0:
-            end_line_num = start_line_num + 1
+    async def _fetch_text(self, url: str) -> str | None:
+        try:
+            return await self._read_capped(url)
+        except (asyncio.TimeoutError, aiohttp.ClientError):
+            # includes the circuit being open - either way, github isn't answering
+            return None
 
-        async with self.session.get(
-            f"https://raw.githubusercontent.com/{owner}/{repo}/{ref}/{file_path}"
-        ) as resp:
+    async def _read_capped(self, url: str) -> str | None:
+        async with http.request(self.session, "GET", url) as resp:
             if resp.status != 200:
-                return
+                return None
 
             # weird code, but basically, we're trying to detect if the file is under
             # 1 MiB, because if it's larger, we really don't want to download all
@@ -320,89 +423,65 @@ class Git(ipy.Extension):
             # and continue on
             try:
                 await resp.content.readexactly(1048577)  # one MiB + 1
-                return
+                return None
             except asyncio.IncompleteReadError as e:
                 content = e.partial
+            except (asyncio.TimeoutError, aiohttp.ClientError):
+                raise  # these should count against github's circuit
             except Exception:  # we can get some random errors
-                return
+                return None
 
             try:
-                file_data = content.decode(resp.get_encoding())
-                if not file_data:
-                    return
+                return content.decode(resp.get_encoding()) or None
             except Exception:  # we can get some random errors
-                return
-
-            line_split = file_data.splitlines()
-            file_data = line_split[start_line_num - 1 :]
+                return None
 
-            if end_line_num > 0:
-                file_data = file_data[: end_line_num - start_line_num]
+    async def fetch_text(self, url: str) -> str | None:
+        # raw files and .diffs are both keyed by their url
+        return await self.inflight.do(("text", url), self._fetch_text, url)
 
-            final_text = textwrap.dedent("\n".join(file_data))
+    async def resolve_issue_num(self, message: ipy.Message, issue_num: int):
+        issue = await self.fetch_issue(issue_num)
+        if not issue:
+            return
 
-            # there's an invisible character here so that the resulting codeblock
-            # doesn't fail if the code we're looking at has ` in it
-            final_text = final_text.replace("`", "`​")
+        if issue.pull_request:
+            embed = self.prepare_pr(issue)
+        else:
+            embed = self.prepare_issue(issue)
 
-            if len(final_text) > 3900:
-                character_count = 0
-                new_final_text = []
-                line_split = final_text.splitlines()
+        await message.reply(embeds=embed)
 
-                for line in line_split:
-                    character_count += len(line)
-                    if character_count > 3900:
-                        break
+    def render_snippet(self, file_data: str, start_line_num: int, end_line_num: int) -> str:
+        line_split = file_data.splitlines()
+        file_data = line_split[start_line_num - 1 :]
 
-                    new_final_text.append(line)
+        if end_line_num > 0:
+            file_data = file_data[: end_line_num - start_line_num]
 
-                final_text = "\n".join(new_final_text)
+        final_text = textwrap.dedent("\n".join(file_data))
 
-            if not final_text:
-                return
+        # there's an invisible character here so that the resulting codeblock
+        # doesn't fail if the code we're looking at has ` in it
+        final_text = final_text.replace("`", "`​")
 
-            embed = ipy.Embed(
-                title=f"{owner}/{repo}",
-                description=f"```{extension}\n{final_text.strip()}\n```",
-                color=ASTRO_COLOR,
-            )
-            component = ipy.Button(style=ipy.ButtonStyle.DANGER, emoji="🗑️", custom_id="gh_delete")
-            await message.suppress_embeds()
-            await message.reply(embeds=embed, components=component)
+        if len(final_text) > 3900:
+            character_count = 0
+            new_final_text = []
+            line_split = final_text.splitlines()
 
-    async def resolve_gh_commit_diff(self, message: ipy.Message):
-        results = GH_COMMIT_REGEX.search(message.content)
+            for line in line_split:
+                character_count += len(line)
+                if character_count > 3900:
+                    break
 
-        if not results:
-            return
+                new_final_text.append(line)
 
-        owner = results[1]
-        repo = results[2]
-        commit_hash = results[3]
+            final_text = "\n".join(new_final_text)
 
-        # get special funky url that gets us diff
-        async with self.session.get(
-            f"https://github.com/{owner}/{repo}/commit/{commit_hash}.diff"
-        ) as resp:
-            if resp.status != 200:
-                return
-
-            try:
-                await resp.content.readexactly(1048577)  # one MiB + 1
-                return
-            except asyncio.IncompleteReadError as e:
-                content = e.partial
-            except Exception:  # we can get some random errors
-                return
-
-            try:
-                file_data = content.decode(resp.get_encoding())
-                if not file_data:
-                    return
-            except Exception:  # we can get some random errors
-                return
+        return final_text
 
+    def render_diff(self, file_data: str) -> list[str]:
         # now, the raw diff we do get is... eh. yeah, it's eh, and i don't want to display it
         # so we'll do some processing to make it not so eh
         processed_diff = unidiff.PatchSet.from_string(file_data)
@@ -449,57 +528,117 @@ class Git(ipy.Extension):
         final_diff = "\n\n".join(final_diff_builder)
         final_diff = final_diff.replace("`", "`​")
 
-        embeds: list[ipy.Embed] = []
+        pages: list[str] = []
         current_entries: list[str] = []
 
         current_length = 0
         line_split = final_diff.splitlines()
 
-        url = f"https://github.com/{owner}/{repo}/commit/{commit_hash}"
-        title = f"{owner}/{repo}@{commit_hash}"
-
-        # the gh embed that gh generates has the title of the commit
-        # if we can find it, exploit it by using the title from the embed as the
-        # title of our own embed
-        if possible_gh_embed := next((e for e in message.embeds if e.url and e.url == url), None):
-            title = possible_gh_embed.title
-        else:
-            with contextlib.suppress(RequestFailed):
-                resp = await self.gh_client.rest.git.async_get_commit(owner, repo, commit_hash)
-                data = resp.parsed_data
-
-                # this is around what gh does for their embeds
-                first_line = data.message.splitlines()[0].strip()
-                with_extras = f"{first_line} · {owner}/{repo}@{data.sha[:7]}"
-                title = with_extras if len(with_extras) <= 70 else f"{with_extras[:67]}..."
-
         for line in line_split:
             current_length += len(line)
             if current_length > 3700:
-                current_text = "\n".join(current_entries).strip()
-                embeds.append(
-                    ipy.Embed(
-                        title=title,
-                        url=url,
-                        description=f"```diff\n{current_text}\n```",
-                        color=ASTRO_COLOR,
-                    )
-                )
+                pages.append("\n".join(current_entries).strip())
                 current_entries = []
                 current_length = 0
 
             current_entries.append(line)
 
         if current_entries:
-            current_text = "\n".join(current_entries).strip()
-            embeds.append(
-                ipy.Embed(
-                    title=title,
-                    url=url,
-                    description=f"```diff\n{current_text}\n```",
-                    color=ASTRO_COLOR,
-                )
+            pages.append("\n".join(current_entries).strip())
+
+        return pages
+
+    async def resolve_gh_snippet(self, message: ipy.Message):
+        # heavily inspired and slightly stolen from
+        # https://github.com/NAFTeam/NAFB/blob/0460e8d2cada81e39909198ba3d84fa25f174e1a/scales/githubMessages.py#L203-L241
+        # NAFB under MIT License, owner LordOfPolls
+
+        results = GH_SNIPPET_REGEX.search(message.content)
+
+        if not results:
+            return
+
+        owner = results[1]
+        repo = results[2]
+        ref = results[3]
+        file_path = results[4]
+        extension = ".".join(file_path.split(".")[1:])
+
+        start_line_num = int(results[5]) if results.end() > 3 and results[5] else 0
+        end_line_num = int(results[6]) if results.end() > 4 and results[6] else -1
+
+        if end_line_num != -1:
+            # i dont even know
+            end_line_num += 1
+
+        if end_line_num != -1 and start_line_num > end_line_num:
+            return
+
+        if end_line_num == -1 and start_line_num > 0:
+            end_line_num = start_line_num + 1
+
+        file_data = await self.fetch_text(
+            f"https://raw.githubusercontent.com/{owner}/{repo}/{ref}/{file_path}"
+        )
+        if not file_data:
+            return
+
+        final_text = self.render_snippet(file_data, start_line_num, end_line_num)
+
+        if not final_text:
+            return
+
+        embed = ipy.Embed(
+            title=f"{owner}/{repo}",
+            description=f"```{extension}\n{final_text.strip()}\n```",
+            color=ASTRO_COLOR,
+        )
+        component = ipy.Button(style=ipy.ButtonStyle.DANGER, emoji="🗑️", custom_id="gh_delete")
+        await message.suppress_embeds()
+        await message.reply(embeds=embed, components=component)
+
+    async def resolve_gh_commit_diff(self, message: ipy.Message):
+        results = GH_COMMIT_REGEX.search(message.content)
+
+        if not results:
+            return
+
+        owner = results[1]
+        repo = results[2]
+        commit_hash = results[3]
+
+        # get special funky url that gets us diff
+        file_data = await self.fetch_text(
+            f"https://github.com/{owner}/{repo}/commit/{commit_hash}.diff"
+        )
+        if not file_data:
+            return
+
+        pages = self.render_diff(file_data)
+
+        url = f"https://github.com/{owner}/{repo}/commit/{commit_hash}"
+        title = f"{owner}/{repo}@{commit_hash}"
+
+        # the gh embed that gh generates has the title of the commit
+        # if we can find it, exploit it by using the title from the embed as the
+        # title of our own embed
+        if possible_gh_embed := next((e for e in message.embeds if e.url and e.url == url), None):
+            title = possible_gh_embed.title
+        elif data := await self.fetch_commit(owner, repo, commit_hash):
+            # this is around what gh does for their embeds
+            first_line = data.message.splitlines()[0].strip()
+            with_extras = f"{first_line} · {owner}/{repo}@{data.sha[:7]}"
+            title = with_extras if len(with_extras) <= 70 else f"{with_extras[:67]}..."
+
+        embeds = [
+            ipy.Embed(
+                title=title,
+                url=url,
+                description=f"```diff\n{page}\n```",
+                color=ASTRO_COLOR,
             )
+            for page in pages
+        ]
 
         if not embeds:
             return
@@ -558,4 +697,5 @@ class Git(ipy.Extension):
 
 
 def setup(bot):
+    importlib.reload(utils)
     Git(bot)
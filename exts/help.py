@@ -1,12 +1,67 @@
 import asyncio
+import datetime
 import importlib
-import io
+import os
 
 import aiohttp
 import interactions as ipy
+from beanie import UpdateResponse
+from beanie.operators import Inc, Set
 
+import common.http as http
+import common.retry as retry
 import common.utils as utils
 from common.const import *
+from common.models import HelpStats, HelpThread
+
+MAX_ATTACHMENT_SIZE = 8388608  # if it's over 8 MiB, that's a bit much
+# discord's limit for everything in one message - attachments past it are skipped
+MAX_UPLOAD_SIZE = 25 * 1024 * 1024
+MAX_CONCURRENT_DOWNLOADS = 4
+
+# posts nobody has said anything in for this long get archived and locked
+ARCHIVE_AFTER = datetime.timedelta(hours=float(os.environ.get("HELP_ARCHIVE_AFTER_HOURS", 72)))
+ARCHIVE_BATCH_SIZE = 10
+# leaves room between batches for everything else the bot needs to do
+ARCHIVE_BATCH_DELAY = 5
+
+STATS_NAME = "help"
+
+
+def mention_posts(posts: list[ipy.GuildForumPost], limit: int):
+    mentions = ""
+    for index, post in enumerate(posts):
+        # leave enough room to say how many didn't fit
+        if len(mentions) + len(post.mention) + 20 > limit:
+            return f"{mentions}and {len(posts) - index} more"
+        mentions += f"{post.mention}, "
+    return mentions.removesuffix(", ") or "None"
+
+
+def seconds_since(when: datetime.datetime, now: datetime.datetime | None = None):
+    # mongo gives back naive datetimes, but they're always in utc
+    when = when.replace(tzinfo=datetime.timezone.utc)
+    return ((now or ipy.Timestamp.utcnow()) - when).total_seconds()
+
+
+def format_duration(seconds: float):
+    minutes, _ = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+
+    parts = [f"{v}{unit}" for v, unit in ((days, "d"), (hours, "h"), (minutes, "m")) if v]
+    return " ".join(parts) or "<1m"
+
+
+def owner_message_pending(error: BaseException):
+    # "thread owner has not sent their initial message" - they have, discord just doesn't know yet
+    return retry.retryable(error) or (
+        isinstance(error, ipy.errors.BadRequest) and "initial message" in str(error.text).lower()
+    )
+
+
+def tag_ids(thread: ipy.GuildForumPost):
+    return [str(tag.id) for tag in thread.applied_tags if tag.id != METADATA["autogenerated_tag"]]
 
 
 async def check_archive(ctx: ipy.BaseContext):
@@ -17,12 +72,237 @@ class HelpChannel(ipy.Extension):
     def __init__(self, bot: ipy.Client):
         self.client = bot
         self.session: aiohttp.ClientSession = bot.session
+        self.retries: retry.RetryQueue = bot.retries
         self.help_channel: ipy.GuildForum = None  # type: ignore
+        # forum id -> its tag select, which only changes when the forum's tags do
+        self.tag_selects: dict[int, ipy.StringSelectMenu] = {}
+        self.archive_task = ipy.Task(self.archive_stale_posts, ipy.IntervalTrigger(hours=1))
+        # threads with nothing left to record - already answered, or not tracked at all -
+        # so messages in them can be skipped without asking mongo
+        self.settled: set[int] = set()
+        # thread id -> who asked in it, for threads still waiting on an answer
+        self.askers: dict[int, str] = {}
+        # thread id -> the first answer in it, for threads whose insert hasn't landed yet
+        self.early_answers: dict[int, ipy.Message | None] = {}
         asyncio.create_task(self.fill_help_channel())
 
     async def fill_help_channel(self):
         await self.bot.wait_until_ready()
         self.help_channel = self.bot.get_channel(METADATA["channels"]["help"])  # type: ignore
+        self.archive_task.start()
+
+    def drop(self):
+        self.archive_task.stop()
+        super().drop()
+
+    async def archive_stale_posts(self):
+        now = ipy.Timestamp.utcnow()
+        stale = [
+            post
+            for post in await self.help_channel.fetch_posts()
+            if not post.archived
+            and not post.pinned
+            and now - ipy.Timestamp.from_snowflake(post.last_message_id or post.id) > ARCHIVE_AFTER
+        ]
+        if not stale:
+            return
+
+        archived: list[ipy.GuildForumPost] = []
+        failed: list[ipy.GuildForumPost] = []
+
+        for index in range(0, len(stale), ARCHIVE_BATCH_SIZE):
+            if index:
+                await asyncio.sleep(ARCHIVE_BATCH_DELAY)
+
+            batch = stale[index : index + ARCHIVE_BATCH_SIZE]
+            results = await asyncio.gather(
+                *(self.archive_stale_post(post) for post in batch), return_exceptions=True
+            )
+            for post, result in zip(batch, results):
+                (failed if isinstance(result, Exception) else archived).append(post)
+
+        await self.send_archive_report(archived, failed)
+
+    async def archive_stale_post(self, post: ipy.GuildForumPost):
+        # nobody is waiting on these, so they shouldn't get in the way of anything that is
+        await self.retries.submit(
+            post.send,
+            (
+                "This thread has been inactive for a while, so it's being closed. Feel free to"
+                " make a new one if you still need help!"
+            ),
+            background=True,
+        )
+        await self.retries.submit(
+            post.edit, archived=True, locked=True, reason="Inactive help thread", background=True
+        )
+        await self.record_closed(post)
+
+    async def send_archive_report(
+        self, archived: list[ipy.GuildForumPost], failed: list[ipy.GuildForumPost]
+    ):
+        logs: ipy.GuildText = self.bot.get_channel(METADATA["channels"]["logs"])  # type: ignore
+        if not logs:
+            return
+
+        embed = ipy.Embed(
+            title="Archived Inactive Help Threads",
+            description=mention_posts(archived, 4096),
+            color=ipy.MaterialColors.RED if failed else ASTRO_COLOR,
+            timestamp=ipy.Timestamp.utcnow(),
+        )
+        embed.add_field("Archived", str(len(archived)), inline=True)
+        embed.add_field(
+            "Inactive For", f"{ARCHIVE_AFTER.total_seconds() / 3600:g} hours", inline=True
+        )
+        if failed:
+            embed.add_field("Failed", mention_posts(failed, 1024))
+
+        await logs.send(embed=embed)
+
+    async def bump_stats(self, amounts: dict[str, float]):
+        if amounts := {k: v for k, v in amounts.items() if v}:
+            await HelpStats.find_one(HelpStats.name == STATS_NAME).update(Inc(amounts), upsert=True)
+
+    async def record_created(self, thread: ipy.GuildForumPost, owner_id: ipy.Snowflake_Type):
+        tags = tag_ids(thread)
+        thread_id = int(thread.id)
+        # known before the insert lands, so an answer that beats it isn't written off
+        self.askers[thread_id] = str(owner_id)
+        self.settled.discard(thread_id)
+        self.early_answers[thread_id] = None
+        try:
+            await HelpThread(
+                thread_id=str(thread.id),
+                owner_id=str(owner_id),
+                created_at=thread.created_at,
+                tags=tags,
+            ).insert()
+        finally:
+            early_answer = self.early_answers.pop(thread_id, None)
+
+        if early_answer:
+            await self.record_answer(early_answer)
+        await self.bump_stats({"created": 1} | {f"tag_counts.{tag}": 1 for tag in tags})
+
+    async def record_closed(self, thread: ipy.GuildForumPost):
+        old = await HelpThread.find_one(
+            HelpThread.thread_id == str(thread.id), HelpThread.closed_at == None  # noqa: E711
+        ).update(
+            Set({HelpThread.closed_at: ipy.Timestamp.utcnow()}),
+            response_type=UpdateResponse.OLD_DOCUMENT,
+        )
+        if old:
+            await self.bump_stats({"closed": 1, "close_seconds": seconds_since(old.created_at)})
+
+    async def record_tags(self, thread: ipy.GuildForumPost, tags: list[int]):
+        new_tags = [str(tag) for tag in tags if tag != METADATA["autogenerated_tag"]]
+        old = await HelpThread.find_one(HelpThread.thread_id == str(thread.id)).update(
+            Set({HelpThread.tags: new_tags}), response_type=UpdateResponse.OLD_DOCUMENT
+        )
+        if not old:
+            return
+
+        amounts: dict[str, float] = {}
+        for tag in old.tags:
+            amounts[f"tag_counts.{tag}"] = amounts.get(f"tag_counts.{tag}", 0) - 1
+        for tag in new_tags:
+            amounts[f"tag_counts.{tag}"] = amounts.get(f"tag_counts.{tag}", 0) + 1
+        await self.bump_stats(amounts)
+
+    @ipy.listen("message_create")
+    async def record_first_response(self, event: ipy.events.MessageCreate):
+        message = event.message
+        thread = message.channel
+        if (
+            message.author.bot
+            or not isinstance(thread, ipy.GuildForumPost)
+            or int(thread.id) in self.settled
+            or int(thread.parent_id) != METADATA["channels"]["help"]
+            or message.author.id == thread.owner_id
+        ):
+            return
+
+        thread_id = int(thread.id)
+        if not (asker := self.askers.get(thread_id)):
+            help_thread = await HelpThread.find_one(HelpThread.thread_id == str(thread.id))
+            if not help_thread or help_thread.first_response_at:
+                self.settled.add(thread_id)
+                return
+            # threads made from the context menu are owned by whoever made them, not the asker
+            asker = self.askers[thread_id] = help_thread.owner_id
+
+        if str(message.author.id) == asker:
+            return
+
+        if thread_id in self.early_answers:
+            # there's nothing to update yet, so record_created takes care of it once there is
+            if not self.early_answers[thread_id]:
+                self.early_answers[thread_id] = message
+            return
+
+        await self.record_answer(message)
+
+    async def record_answer(self, message: ipy.Message):
+        thread_id = int(message.channel.id)
+
+        # two answers landing together can both get this far, and the filter makes sure
+        # only one of them counts
+        old = await HelpThread.find_one(
+            HelpThread.thread_id == str(thread_id),
+            HelpThread.first_response_at == None,  # noqa: E711
+        ).update(
+            Set(
+                {
+                    HelpThread.first_response_at: message.timestamp,
+                    HelpThread.first_responder_id: str(message.author.id),
+                }
+            ),
+            response_type=UpdateResponse.OLD_DOCUMENT,
+        )
+        # if this didn't count, the next message looks the thread up again to see why
+        self.askers.pop(thread_id, None)
+        if not old:
+            return
+
+        self.settled.add(thread_id)
+        # the message's own timestamp, so time spent getting here doesn't count
+        await self.bump_stats(
+            {
+                "responded": 1,
+                "response_seconds": seconds_since(old.created_at, message.timestamp),
+            }
+        )
+
+    @ipy.slash_command("help-stats", description="Shows how quickly help threads get answered.")
+    async def help_stats(self, ctx: ipy.InteractionContext):
+        stats = await HelpStats.find_one(HelpStats.name == STATS_NAME) or HelpStats(name=STATS_NAME)
+
+        embed = ipy.Embed(title="Help Forum Stats", color=ASTRO_COLOR)
+        embed.add_field("Threads Created", str(stats.created), inline=True)
+        embed.add_field("Threads Answered", str(stats.responded), inline=True)
+        embed.add_field("Threads Closed", str(stats.closed), inline=True)
+        embed.add_field(
+            "Average Time to First Reply",
+            format_duration(stats.response_seconds / stats.responded) if stats.responded else "N/A",
+            inline=True,
+        )
+        embed.add_field(
+            "Average Time to Close",
+            format_duration(stats.close_seconds / stats.closed) if stats.closed else "N/A",
+            inline=True,
+        )
+
+        tag_names = {str(tag.id): tag.name for tag in self.help_channel.available_tags}
+        top_tags = sorted(
+            ((count, tag) for tag, count in stats.tag_counts.items() if count > 0), reverse=True
+        )[:5]
+        embed.add_field(
+            "Most Used Tags",
+            "\n".join(f"{tag_names.get(tag, 'Deleted tag')}: {count}" for count, tag in top_tags)
+            or "N/A",
+        )
+        await ctx.send(embed=embed)
 
     @ipy.context_menu("Create Help Thread", context_type=ipy.CommandType.MESSAGE)
     async def create_thread_context_menu(self, ctx: ipy.ContextMenuContext):
@@ -61,6 +341,9 @@ class HelpChannel(ipy.Extension):
         await ctx.send(":white_check_mark: Modal sent.", ephemeral=True)
 
     def generate_tag_select(self, channel: ipy.GuildForum):
+        if select := self.tag_selects.get(int(channel.id)):
+            return select
+
         tags = channel.available_tags
         options: list[ipy.StringSelectOption] = []
 
@@ -83,13 +366,56 @@ class HelpChannel(ipy.Extension):
                 emoji=ipy.PartialEmoji.from_str("🗑"),
             ),
         )
-        return ipy.StringSelectMenu(
+        select = ipy.StringSelectMenu(
             *options,
             placeholder="Select the tags you want",
             min_values=1,
             max_values=len(options),
             custom_id="tag_selection",
         )
+        self.tag_selects[int(channel.id)] = select
+        return select
+
+    @ipy.listen("channel_update")
+    async def invalidate_tag_select(self, event: ipy.events.ChannelUpdate):
+        # tags may have been added, removed or renamed, so just build it again next time
+        self.tag_selects.pop(int(event.after.id), None)
+
+    async def download_attachments(self, attachments: list[ipy.Attachment]) -> list[ipy.File]:
+        # the budget is taken out up front and in order, so the first attachments win
+        budget = MAX_UPLOAD_SIZE
+        wanted: list[ipy.Attachment] = []
+        for attachment in attachments:
+            if attachment.size > MAX_ATTACHMENT_SIZE or attachment.size > budget:
+                continue
+            budget -= attachment.size
+            wanted.append(attachment)
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+        opened = []
+
+        async def download(attachment: ipy.Attachment):
+            async with semaphore:
+                try:
+                    file = await http.download(self.session, attachment.proxy_url, attachment.size)
+                except (asyncio.TimeoutError, aiohttp.ClientError, ValueError):
+                    return None
+                opened.append(file)
+                return file
+
+        try:
+            downloaded = await asyncio.gather(*(download(a) for a in wanted))
+        except BaseException:
+            # whoever called us never gets these, so they'd never be closed otherwise
+            for file in opened:
+                file.close()
+            raise
+
+        return [
+            ipy.File(file, file_name=attachment.filename)
+            for attachment, file in zip(wanted, downloaded)
+            if file
+        ]
 
     @ipy.listen("modal_completion")
     async def context_menu_handling(self, event: ipy.events.ModalCompletion):
@@ -115,33 +441,22 @@ class HelpChannel(ipy.Extension):
                 )
 
             files: list[ipy.File] = []
-
             if message.attachments:
-                for attahcment in message.attachments:
-                    if attahcment.size > 8388608:  # if it's over 8 MiB, that's a bit much
-                        continue
-
-                    async with self.session.get(attahcment.proxy_url) as resp:
-                        try:
-                            resp.raise_for_status()
-                        except aiohttp.ClientResponseError:
-                            continue
-
-                        raw_file = await resp.read()
-                        files.append(ipy.File(io.BytesIO(raw_file), file_name=attahcment.filename))
-
-            post_thread = await self.help_channel.create_post(
-                ctx.responses["help_thread_name"],
-                content=ctx.responses["edit_content"],
-                applied_tags=[str(METADATA["autogenerated_tag"])],
-                auto_archive_duration=1440,  # type: ignore
-                files=files,  # type: ignore
-                reason="Auto help thread creation",
-                allowed_mentions=ipy.AllowedMentions.none(),
-            )
-
-            await post_thread.add_member(ctx.author)
-            await post_thread.add_member(message.author)
+                files = await self.download_attachments(message.attachments)
+
+            try:
+                post_thread = await self.help_channel.create_post(
+                    ctx.responses["help_thread_name"],
+                    content=ctx.responses["edit_content"],
+                    applied_tags=[str(METADATA["autogenerated_tag"])],
+                    auto_archive_duration=1440,  # type: ignore
+                    files=files,  # type: ignore
+                    reason="Auto help thread creation",
+                    allowed_mentions=ipy.AllowedMentions.none(),
+                )
+            finally:
+                for file in files:
+                    file.file.close()
 
             embed = None
 
@@ -166,22 +481,33 @@ class HelpChannel(ipy.Extension):
                 custom_id="close_thread",
             )
 
-            starter_message = await post_thread.send(
-                (
-                    "This help thread was automatically generated. Read the message"
-                    " above for more information."
+            async def send_starter_message():
+                starter_message = await post_thread.send(
+                    (
+                        "This help thread was automatically generated. Read the message"
+                        " above for more information."
+                    ),
+                    embeds=embed,
+                    components=[[original_message_button], [select], [close_button]],
+                )
+                await self.retries.submit(starter_message.pin)
+
+            # none of these depend on each other, so there's no reason to wait on them one
+            # at a time - interactions.py still queues up any that share a rate limit bucket
+            await asyncio.gather(
+                ctx.send(":white_check_mark: Thread created.", ephemeral=True),
+                self.record_created(post_thread, message.author.id),
+                *(
+                    post_thread.add_member(user_id)
+                    for user_id in {ctx.author.id, message.author.id}
+                ),
+                send_starter_message(),
+                message.reply(
+                    f"Hey, {message.author.mention}! At this time, we only help with"
+                    " support-related questions in our help channel. Please redirect to"
+                    f" {post_thread.mention} in order to receive help."
                 ),
-                embeds=embed,
-                components=[[original_message_button], [select], [close_button]],
-            )
-            await starter_message.pin()
-
-            await message.reply(
-                f"Hey, {message.author.mention}! At this time, we only help with"
-                " support-related questions in our help channel. Please redirect to"
-                f" {post_thread.mention} in order to receive help."
             )
-            await ctx.send(":white_check_mark: Thread created.", ephemeral=True)
 
     @ipy.listen("new_thread_create")
     async def first_message_for_help(self, event: ipy.events.NewThreadCreate):
@@ -203,22 +529,19 @@ class HelpChannel(ipy.Extension):
             custom_id="close_thread",
         )
 
-        try:
-            message = await thread.send(
-                "Hey! Once your issue is solved, press the button below to close this thread!",
-                components=[[select], [close_button]],
-            )
-        except ipy.errors.HTTPException:
-            # this tends to happen often if the "thread author has not sent their initial message"
+        async def send_first_message():
+            # the first try tends to fail with "thread author has not sent their initial message"
             # techically, they already did because you can't make a thread otherwise...
-            # so we're just waiting for discord to get the memo
-            await asyncio.sleep(5)
-            message = await thread.send(
+            # so we keep trying for a bit while discord gets the memo
+            message = await self.retries.submit(
+                thread.send,
                 "Hey! Once your issue is solved, press the button below to close this thread!",
                 components=[[select], [close_button]],
+                retry_on=owner_message_pending,
             )
+            await self.retries.submit(message.pin)
 
-        await message.pin()
+        await asyncio.gather(send_first_message(), self.record_created(thread, thread.owner_id))
 
     @ipy.component_callback("tag_selection")  # type: ignore
     async def modify_tags(self, ctx: ipy.ComponentContext):
@@ -236,6 +559,7 @@ class HelpChannel(ipy.Extension):
         tags = [int(v) for v in ctx.values] if "remove_all_tags" not in ctx.values else []
         await channel.edit(applied_tags=tags)
         await ctx.send(":white_check_mark: Done.", ephemeral=True)
+        await self.record_tags(channel, tags)
 
     @ipy.component_callback("TAG_SELECTION")  # type: ignore
     async def legacy_modify_tags(self, ctx: ipy.ComponentContext):
@@ -250,6 +574,7 @@ class HelpChannel(ipy.Extension):
     async def archive(self, ctx: ipy.InteractionContext):
         await ctx.send(":white_check_mark: Archiving...")
         await ctx.channel.edit(archived=True, locked=True)
+        await self.record_closed(ctx.channel)  # type: ignore
 
     @ipy.component_callback("close_thread")  # type: ignore
     async def close_help_thread(self, ctx: ipy.ComponentContext):
@@ -263,6 +588,7 @@ class HelpChannel(ipy.Extension):
 
         await ctx.send(":white_check_mark: Closing. Thank you for using our help system.")
         await ctx.channel.edit(archived=True, locked=True)
+        await self.record_closed(ctx.channel)  # type: ignore
 
     @ipy.component_callback("close thread")  # type: ignore
     async def legacy_close_thread(self, ctx: ipy.ComponentContext):
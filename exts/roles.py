@@ -1,12 +1,53 @@
 import asyncio
+import collections
+import datetime
 import importlib
+import logging
+import re
+import time
 import typing
 
 import interactions as ipy
 import tansy
+from beanie import PydanticObjectId
 
+import common.role_edits as role_edits
 import common.utils as utils
 from common.const import METADATA
+from common.models import RoleJob, RoleJobStatus
+
+ID_REGEX = re.compile(r"\d{15,20}")
+
+# how many role changes can be in flight at once, across every bulk job
+BULK_WORKERS = 3
+# progress is saved after every chunk, so at most this many get redone after a restart
+BULK_CHUNK_SIZE = 25
+BULK_PROGRESS_INTERVAL = 10
+
+logger = logging.getLogger("astro_bot.roles")
+
+
+def parse_date(text: str):
+    try:
+        return datetime.datetime.strptime(text, "%Y-%m-%d").replace(tzinfo=datetime.timezone.utc)
+    except ValueError:
+        raise ipy.errors.BadArgument(f"`{text}` isn't a date in the format YYYY-MM-DD.") from None
+
+
+def describe_job(job: RoleJob, role_name: str):
+    action = "adding" if job.add else "removing"
+    counts = (
+        f"{job.position}/{len(job.member_ids)} done ({job.succeeded} changed,"
+        f" {job.skipped} skipped, {job.failed} failed)"
+    )
+
+    if job.status == RoleJobStatus.DONE:
+        return f":white_check_mark: Finished {action} `{role_name}`: {counts}."
+    if job.status == RoleJobStatus.CANCELLED:
+        return f":x: Cancelled {action} `{role_name}`: {counts}."
+    if job.status == RoleJobStatus.FAILED:
+        return f":warning: Stopped {action} `{role_name}` after an error: {counts}."
+    return f":hourglass: {action.capitalize()} `{role_name}`: {counts}. Job ID: `{job.id}`"
 
 
 async def check_admin(ctx: ipy.BaseContext):
@@ -19,6 +60,10 @@ class Roles(ipy.Extension):
     def __init__(self, bot: ipy.Client):
         self.client = bot
         self.guild: ipy.Guild = None  # type: ignore
+        self.role_edits = role_edits.RoleEditQueue(bot)
+
+        self.bulk_semaphore = asyncio.Semaphore(BULK_WORKERS)
+        self.bulk_tasks: dict[str, asyncio.Task] = {}
 
         asyncio.create_task(self.fill_guild())
 
@@ -26,6 +71,225 @@ class Roles(ipy.Extension):
         await self.bot.wait_until_ready()
         self.guild = self.bot.get_guild(METADATA["guild"])  # type: ignore
 
+        # pick up where we left off with any jobs a restart interrupted
+        async for job in RoleJob.find(RoleJob.status == RoleJobStatus.RUNNING):
+            self.start_role_job(job)
+
+    def drop(self):
+        # they're still marked as running, so they'll be resumed when we're loaded again
+        for task in self.bulk_tasks.values():
+            task.cancel()
+        super().drop()
+
+    def start_role_job(self, job: RoleJob):
+        self.bulk_tasks[str(job.id)] = asyncio.create_task(self.run_role_job(job))
+
+    async def run_role_job(self, job: RoleJob):
+        last_report = 0.0
+
+        try:
+            while job.status == RoleJobStatus.RUNNING:
+                chunk = job.member_ids[job.position : job.position + BULK_CHUNK_SIZE]
+                results = collections.Counter(
+                    await asyncio.gather(*(self.apply_job_role(job, int(m)) for m in chunk))
+                )
+
+                job.position += len(chunk)
+                job.succeeded += results["succeeded"]
+                job.skipped += results["skipped"]
+                job.failed += results["failed"]
+                if job.position >= len(job.member_ids):
+                    job.status = RoleJobStatus.DONE
+                # only the counters change, so there's no need to send the member list every time
+                await job.set(
+                    {
+                        RoleJob.position: job.position,
+                        RoleJob.succeeded: job.succeeded,
+                        RoleJob.skipped: job.skipped,
+                        RoleJob.failed: job.failed,
+                        RoleJob.status: job.status,
+                    }
+                )
+
+                if (
+                    job.status != RoleJobStatus.RUNNING
+                    or time.monotonic() - last_report > BULK_PROGRESS_INTERVAL
+                ):
+                    await self.report_role_job(job)
+                    last_report = time.monotonic()
+        except Exception:
+            # nothing awaits this task, so this is the only place the error would show up
+            logger.exception(f"Bulk role job {job.id} failed.")
+            job.status = RoleJobStatus.FAILED
+            try:
+                await job.set({RoleJob.status: job.status})
+                await self.report_role_job(job)
+            except Exception:
+                logger.exception(f"Could not mark bulk role job {job.id} as failed.")
+        finally:
+            self.bulk_tasks.pop(str(job.id), None)
+
+    async def apply_job_role(self, job: RoleJob, member_id: int):
+        member = self.guild.get_member(member_id)
+        # they either left or already are how we want them to be
+        if not member or member.has_role(job.role_id) == job.add:
+            return "skipped"
+
+        async with self.bulk_semaphore:
+            try:
+                # interactions.py queues these up per rate limit bucket for us
+                if job.add:
+                    await self.bot.http.add_guild_member_role(
+                        self.guild.id, member_id, job.role_id, reason="Bulk role job"
+                    )
+                else:
+                    await self.bot.http.remove_guild_member_role(
+                        self.guild.id, member_id, job.role_id, reason="Bulk role job"
+                    )
+            except ipy.errors.HTTPException:
+                return "failed"
+
+        return "succeeded"
+
+    async def report_role_job(self, job: RoleJob):
+        channel: ipy.GuildText = self.bot.get_channel(int(job.channel_id))  # type: ignore
+        if not channel:
+            return
+
+        role = self.guild.get_role(int(job.role_id))
+        content = describe_job(job, role.name if role else job.role_id)
+
+        try:
+            if job.message_id:
+                message = await channel.fetch_message(int(job.message_id))
+                await message.edit(content=content)
+            else:
+                message = await channel.send(content)
+                await job.set({RoleJob.message_id: str(message.id)})
+        except ipy.errors.HTTPException:
+            # not worth stopping the job over
+            pass
+
+    bulk_role = tansy.TansySlashCommand(
+        name="bulk-role",
+        description="Gives or takes a role from lots of members at once.",  # type: ignore
+        default_member_permissions=ipy.Permissions.MANAGE_ROLES,
+    )
+
+    @bulk_role.subcommand(
+        sub_cmd_name="start",
+        sub_cmd_description="Starts giving or taking a role from every member that matches.",
+    )
+    @utils.mods_only()
+    async def bulk_role_start(
+        self,
+        ctx: ipy.InteractionContext,
+        role: ipy.Role = tansy.Option("The role to give or take."),
+        action: str = tansy.Option(
+            "Whether to give or take the role.",
+            choices=[
+                ipy.SlashCommandChoice(name="Add", value="add"),
+                ipy.SlashCommandChoice(name="Remove", value="remove"),
+            ],
+        ),
+        has_role: typing.Optional[ipy.Role] = tansy.Option(
+            "Only members with this role.", default=None
+        ),
+        joined_after: typing.Optional[str] = tansy.Option(
+            "Only members who joined after this date (YYYY-MM-DD).", default=None
+        ),
+        joined_before: typing.Optional[str] = tansy.Option(
+            "Only members who joined before this date (YYYY-MM-DD).", default=None
+        ),
+        member_ids: typing.Optional[str] = tansy.Option(
+            "Only these members, as a list of IDs.", default=None
+        ),
+    ):
+        if not any((has_role, joined_after, joined_before, member_ids)):
+            raise ipy.errors.BadArgument("Pick at least one way to choose members.")
+        if role.managed or role.id == self.guild.id:
+            raise ipy.errors.BadArgument("That role can't be given out by hand.")
+
+        add = action == "add"
+        members = self.guild.members
+
+        if member_ids:
+            ids = set(ID_REGEX.findall(member_ids))
+            members = [m for m in members if str(m.id) in ids]
+        if has_role:
+            members = [m for m in members if m.has_role(has_role)]
+        if joined_after:
+            after = parse_date(joined_after)
+            members = [m for m in members if m.joined_at > after]
+        if joined_before:
+            before = parse_date(joined_before)
+            members = [m for m in members if m.joined_at < before]
+
+        members = [m for m in members if m.has_role(role) != add]
+        if not members:
+            raise ipy.errors.BadArgument("No members need that change.")
+
+        job = RoleJob(
+            role_id=str(role.id),
+            add=add,
+            member_ids=[str(m.id) for m in members],
+            author_id=str(ctx.author.id),
+            channel_id=str(ctx.channel_id),
+            created_at=ipy.Timestamp.utcnow(),
+        )
+        await job.insert()
+        self.start_role_job(job)
+
+        await ctx.send(
+            (
+                f":white_check_mark: Started job `{job.id}` for {len(members)} members. Progress"
+                " will be posted in this channel."
+            ),
+            ephemeral=True,
+        )
+
+    @bulk_role.subcommand(
+        sub_cmd_name="status",
+        sub_cmd_description="Shows how the bulk role jobs that are running are doing.",
+    )
+    @utils.mods_only()
+    async def bulk_role_status(self, ctx: ipy.InteractionContext):
+        jobs = await RoleJob.find(RoleJob.status == RoleJobStatus.RUNNING).to_list()
+        if not jobs:
+            await ctx.send("No bulk role jobs are running.", ephemeral=True)
+            return
+
+        lines = []
+        for job in jobs:
+            role = self.guild.get_role(int(job.role_id))
+            lines.append(describe_job(job, role.name if role else job.role_id))
+        await ctx.send("\n".join(lines), ephemeral=True)
+
+    @bulk_role.subcommand(
+        sub_cmd_name="cancel",
+        sub_cmd_description="Stops a bulk role job. Changes already made are kept.",
+    )
+    @utils.mods_only()
+    async def bulk_role_cancel(
+        self,
+        ctx: ipy.InteractionContext,
+        job_id: str = tansy.Option("The ID of the job to cancel."),
+    ):
+        job = (
+            await RoleJob.get(PydanticObjectId(job_id))
+            if PydanticObjectId.is_valid(job_id)
+            else None
+        )
+        if not job or job.status != RoleJobStatus.RUNNING:
+            raise ipy.errors.BadArgument("There is no running job with that ID.")
+
+        if task := self.bulk_tasks.pop(job_id, None):
+            task.cancel()
+
+        await job.set({RoleJob.status: RoleJobStatus.CANCELLED})
+        await self.report_role_job(job)
+        await ctx.send(":white_check_mark: Cancelled.", ephemeral=True)
+
     @tansy.slash_command(
         "subscribe",
         description="Subscribes (or unsubscribes) you to updates via self-assignable roles.",
@@ -57,17 +321,20 @@ class Roles(ipy.Extension):
         if typing.TYPE_CHECKING:
             assert isinstance(ctx.author, ipy.Member)
 
-        author_roles = set(ctx.author._role_ids)  # don't want to update roles till end
+        # don't want to update roles till end - and any changes still on their way
+        # to discord count, so a quick double use toggles the role back
+        to_add: list[int] = []
+        to_remove: list[int] = []
         str_builder = [":white_check_mark:"]
 
         for role_id in changelog.split(" "):  # kinda smart way of fitting 2+ roles in a choice
             action_word = ""
 
-            if ctx.author.has_role(role_id):
-                author_roles.remove(int(role_id))
+            if self.role_edits.has_role(ctx.author, role_id):
+                to_remove.append(int(role_id))
                 action_word = "removed"
             else:
-                author_roles.add(int(role_id))
+                to_add.append(int(role_id))
                 action_word = "added"
 
             role = self.guild.get_role(role_id)
@@ -80,7 +347,7 @@ class Roles(ipy.Extension):
             # which seems pretty natural to me
             str_builder.append(f"{role_name} role {action_word}.")
 
-        await ctx.author.edit(roles=author_roles)
+        await self.role_edits.edit(ctx.author, add=to_add, remove=to_remove)
 
         await ctx.send(
             " ".join(str_builder),
@@ -131,7 +398,8 @@ class Roles(ipy.Extension):
             assert isinstance(ctx.author, ipy.Member)
 
         # same idea as subscribe, but...
-        author_roles = set(ctx.author._role_ids)
+        to_add: list[int] = []
+        to_remove: list[int] = []
 
         # since there are a lot more languages than roles, i wanted to make the result
         # message a bit nicer. that requires having both of these lists
@@ -150,14 +418,14 @@ class Roles(ipy.Extension):
                     ipy.MaterialColors.RED,
                 )
 
-            if ctx.author.has_role(role["id"]):
-                author_roles.remove(int(role["id"]))
+            if self.role_edits.has_role(ctx.author, role["id"]):
+                to_remove.append(int(role["id"]))
                 removed.append(f"`{language}`")  # thankfully, the language here is its role name
             else:
-                author_roles.add(int(role["id"]))
+                to_add.append(int(role["id"]))
                 added.append(f"`{language}`")
 
-        await ctx.author.edit(roles=author_roles)
+        await self.role_edits.edit(ctx.author, add=to_add, remove=to_remove)
 
         resp = ":white_check_mark: "
         # yep, all we're doing is listing out the roles added and removed
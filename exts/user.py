@@ -1,14 +1,34 @@
 import asyncio
+import datetime
+import importlib
+import time
 
 import interactions as ipy
+import tansy
 
+import common.utils as utils
 from common.const import *
+from common.models import Report
+
+# reports of the same user this close together get rolled into one log message
+REPORT_WINDOW = 600
+
+
+class ReportStorm:
+    """The reports of one user within a window, after the first one has been logged."""
+
+    def __init__(self) -> None:
+        self.started_at = time.monotonic()
+        self.reporters: set[int] = set()
+        self.pending: list[tuple[int, str]] = []
 
 
 class UserExt(ipy.Extension):
     def __init__(self, bot: ipy.Client):
         self.client = bot
         self.action_logs: ipy.GuildText = None  # type: ignore
+        # reported user id -> their reports in the current window
+        self.report_storms: dict[int, ReportStorm] = {}
         asyncio.create_task(self.fill_action_logs())
 
     async def fill_action_logs(self):
@@ -89,6 +109,47 @@ class UserExt(ipy.Extension):
                 )
                 return
 
+            reason = ctx.responses.get("report_user_reason", "N/A")
+            storm = self.report_storms.get(member.id)
+            if storm and time.monotonic() - storm.started_at > REPORT_WINDOW:
+                # its flush is about to run, so anything new starts over
+                storm = None
+
+            if storm and ctx.author.id in storm.reporters:
+                await ctx.send(":x: You've already reported this user recently.", ephemeral=True)
+                return
+
+            # all of this happens before the first await, so reports that come in together
+            # (or a double click) see each other rather than each starting their own storm
+            first = storm is None
+            if not storm:
+                storm = self.report_storms[member.id] = ReportStorm()
+                asyncio.get_running_loop().call_later(
+                    REPORT_WINDOW, lambda: asyncio.create_task(self.flush_reports(member, storm))
+                )
+            else:
+                # the mods already know about this person - they'll get the rest in one go
+                storm.pending.append((ctx.author.id, reason))
+            storm.reporters.add(ctx.author.id)
+
+            try:
+                await Report(
+                    reported_id=str(member.id),
+                    reporter_id=str(ctx.author.id),
+                    reason=reason,
+                    created_at=ipy.Timestamp.utcnow(),
+                ).insert()
+            except Exception:
+                # so they can try again
+                storm.reporters.discard(ctx.author.id)
+                if not first:
+                    storm.pending.remove((ctx.author.id, reason))
+                raise
+
+            if not first:
+                await ctx.send(":white_check_mark: Report sent.", ephemeral=True)
+                return
+
             embed = ipy.Embed(
                 title="User Reported",
                 color=ipy.MaterialColors.DEEP_ORANGE,
@@ -96,11 +157,77 @@ class UserExt(ipy.Extension):
             embed.set_author(member.tag, icon_url=member.display_avatar.as_url(size=128))
             embed.add_field("Reported User", f"<@{member_id}>", inline=True)
             embed.add_field("Reported By", ctx.author.mention, inline=True)
-            embed.add_field("Reason", ctx.responses.get("report_user_reason", "N/A"), inline=False)
+            embed.add_field("Reason", reason, inline=False)
 
             await self.action_logs.send(embed=embed)
             await ctx.send(":white_check_mark: Report sent.", ephemeral=True)
 
+    async def flush_reports(self, member: ipy.Member, storm: ReportStorm):
+        if self.report_storms.get(member.id) is storm:
+            del self.report_storms[member.id]
+        if not storm.pending:
+            return
+
+        embed = ipy.Embed(
+            title="User Reported Again",
+            description=(
+                f"<@{member.id}> was reported {len(storm.pending)} more time(s) in the"
+                f" {REPORT_WINDOW // 60} minutes after the report above."
+            ),
+            color=ipy.MaterialColors.DEEP_ORANGE,
+        )
+        embed.set_author(member.tag, icon_url=member.display_avatar.as_url(size=128))
+        # embeds can only have 25 fields, and the full list is a /reports away
+        for reporter_id, reason in storm.pending[:10]:
+            embed.add_field("Reason", f"<@{reporter_id}>: {reason}"[:1024], inline=False)
+        if len(storm.pending) > 10:
+            embed.set_footer(text=f"And {len(storm.pending) - 10} more. Use /reports for them all.")
+
+        await self.action_logs.send(embed=embed)
+
+    @tansy.slash_command(
+        "reports",
+        description="Looks up the reports of (or by) a user.",
+        default_member_permissions=ipy.Permissions.MODERATE_MEMBERS,
+    )
+    @utils.mods_only()
+    async def reports(
+        self,
+        ctx: ipy.InteractionContext,
+        user: ipy.User = tansy.Option("The user to look up."),
+        made_by: bool = tansy.Option(
+            "Show the reports this user made, rather than the ones about them.", default=False
+        ),
+    ):
+        await ctx.defer(ephemeral=True)
+
+        query = (
+            Report.find(Report.reporter_id == str(user.id))
+            if made_by
+            else Report.find(Report.reported_id == str(user.id))
+        )
+        total = await query.count()
+        latest = await query.sort(-Report.created_at).limit(10).to_list()
+
+        embed = ipy.Embed(
+            title=f"Reports {'By' if made_by else 'Of'} {user.tag}",
+            description=f"{total} report(s) in total." if total else "No reports.",
+            color=ASTRO_COLOR,
+        )
+        for report in latest:
+            other_id = report.reported_id if made_by else report.reporter_id
+            # mongo gives back naive datetimes, but they're always in utc
+            created_at = report.created_at.replace(tzinfo=datetime.timezone.utc)
+            when = ipy.Timestamp.fromdatetime(created_at).format("R")
+            embed.add_field(
+                "Reported" if made_by else "Reported By",
+                f"<@{other_id}> {when}\n{report.reason}"[:1024],
+                inline=False,
+            )
+
+        await ctx.send(embed=embed, ephemeral=True)
+
 
 def setup(bot):
+    importlib.reload(utils)
     UserExt(bot)